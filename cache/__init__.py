@@ -0,0 +1,20 @@
+"""
+In-process caches used by the API routes.
+"""
+from .panchang import PanchangCache, panchang_cache
+from .read_model import ReadModel, ReadModelSnapshot, read_model
+from .responses import CachedResponse, ResponseCache, response_cache
+from .singleflight import SingleFlight, scrape_flights
+
+__all__ = [
+    "PanchangCache",
+    "panchang_cache",
+    "ReadModel",
+    "ReadModelSnapshot",
+    "read_model",
+    "CachedResponse",
+    "ResponseCache",
+    "response_cache",
+    "SingleFlight",
+    "scrape_flights",
+]
@@ -0,0 +1,177 @@
+"""
+TTL cache for today's panchang information served by /today.
+
+When no panchang has been scraped yet and the source can't be reached, the
+date fields are computed locally and the panchang fields are left empty.
+
+Only the scraping leader scrapes the panchang. It stores each scrape in the
+database, and the other workers read today's stored value instead.
+"""
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from config import NEPAL_TZ, PANCHANG_CACHE_TTL_SECONDS, PANCHANG_RETRY_SECONDS
+from database.crud import panchang_day_crud
+from database.executor import run_db
+from nepali_date import (
+    AD_MONTH_NAMES, NEPALI_MONTHS, ENGLISH_TO_NEPALI_WEEKDAYS, WEEKDAY_NAMES, today_bs, to_devanagari
+)
+from scraping.calendar import scrape_panchang
+
+logger = logging.getLogger(__name__)
+
+# Panchang fields that can only come from the source
+PANCHANG_FIELDS = (
+    "nepal_sambat", "tithi", "paksha", "nakshatra", "yoga", "karana",
+    "moon_rashi", "dinman", "ritu", "ayana", "sunrise", "sunset",
+    "moonrise", "moonset", "sun_moon_info", "event",
+)
+
+
+def local_today_info(now: Optional[datetime] = None) -> Dict:
+    """
+    Build today's date information without scraping.
+    
+    Args:
+        now: Current time, defaults to now in Nepal
+        
+    Returns:
+        Dictionary shaped like scrape_panchang's, with empty panchang fields
+    """
+    now = now or datetime.now(NEPAL_TZ)
+    bs = today_bs(now)
+    
+    nepali_year = to_devanagari(bs.year)
+    nepali_month = NEPALI_MONTHS[bs.month]
+    nepali_day = to_devanagari(bs.day)
+    # Fixed tables rather than strftime, whose names follow the process locale
+    english_weekday = WEEKDAY_NAMES[now.weekday()]
+    nepali_weekday = ENGLISH_TO_NEPALI_WEEKDAYS[english_weekday]
+    english_year, english_month, english_day = str(now.year), AD_MONTH_NAMES[now.month - 1], str(now.day)
+    
+    today_info = {field: "" for field in PANCHANG_FIELDS}
+    today_info.update({
+        "nepali_date": f"{nepali_year} {nepali_month} {nepali_day} {nepali_weekday}",
+        "english_date": f"{english_year} {english_month} {english_day}, {english_weekday}",
+        "nepali_year": nepali_year,
+        "nepali_month": nepali_month,
+        "nepali_month_num": bs.month,
+        "nepali_day": nepali_day,
+        "nepali_weekday": nepali_weekday,
+        "english_year": english_year,
+        "english_month": english_month,
+        "english_day": english_day,
+        "english_weekday": english_weekday,
+        "nepali_date_text": f"नेपाली पात्रो{english_day}-{english_month}-{english_year}",
+        "today_text": f"आज {nepali_year} {nepali_month}",
+        "weekday_tithi": nepali_weekday,
+    })
+    return today_info
+
+
+class PanchangCache:
+    """Cache for the parsed `today_info` dictionary returned by scrape_panchang.
+
+    Entries expire at Nepal-local midnight or after `ttl_seconds`, whichever
+    comes first. Once an entry has expired the last good value keeps being
+    served while a single refresh runs in the background. While `enabled` is
+    False (a worker that doesn't own scraping) refreshes read the value the
+    leader stored instead of scraping.
+    """
+
+    def __init__(self, ttl_seconds: float = PANCHANG_CACHE_TTL_SECONDS,
+                 retry_seconds: float = PANCHANG_RETRY_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self.retry_seconds = retry_seconds
+        self._value: Dict = {}
+        self._expires_at: Optional[datetime] = None
+        self._retry_at: Optional[datetime] = None
+        self._lock = asyncio.Lock()
+        self._refresh_task: Optional[asyncio.Task] = None
+        self.enabled = True
+
+    def _expiry_for(self, now: datetime) -> datetime:
+        """Return when a value fetched at `now` should expire."""
+        next_midnight = (now + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+        return min(now + timedelta(seconds=self.ttl_seconds), next_midnight)
+
+    def is_fresh(self) -> bool:
+        """Check whether the cached value exists and has not expired."""
+        return bool(self._value) and self._expires_at is not None and \
+            datetime.now(NEPAL_TZ) < self._expires_at
+
+    async def get(self) -> Dict:
+        """Get today's panchang, fetching it only when nothing is cached yet.
+        
+        Falls back to the locally computed date when nothing could be fetched.
+        """
+        if self.is_fresh():
+            return self._value
+
+        if self._value:
+            # Serve the last good value while refreshing in the background
+            self.refresh_in_background()
+            return self._value
+
+        return await self.refresh() or local_today_info()
+
+    def refresh_in_background(self) -> None:
+        """Start a background refresh unless one is running or a retry is pending."""
+        if self._refresh_task and not self._refresh_task.done():
+            return
+        if self._retry_at and datetime.now(NEPAL_TZ) < self._retry_at:
+            return
+        self._refresh_task = asyncio.create_task(self.refresh())
+
+    async def _fetch(self) -> Dict:
+        """Scrape today's panchang and store it for the other workers, or read the stored one."""
+        today = datetime.now(NEPAL_TZ).date().isoformat()
+        if not self.enabled:
+            stored = await run_db(panchang_day_crud.get, today)
+            return stored.info if stored else {}
+
+        today_info = await scrape_panchang(None)
+        if today_info:
+            try:
+                await run_db(panchang_day_crud.save, date=today, info=today_info)
+            except Exception as e:
+                logger.error(f"Error storing panchang: {str(e)}")
+        return today_info
+
+    async def refresh(self) -> Optional[Dict]:
+        """Fetch today's panchang and cache it if it was found.
+        
+        Returns None when it couldn't be fetched, so scrape cycles report the
+        failure; the last cached value is kept.
+        """
+        async with self._lock:
+            # Another caller may have refreshed while we waited for the lock
+            if self.is_fresh():
+                return self._value
+            if self._retry_at and datetime.now(NEPAL_TZ) < self._retry_at:
+                return self._value
+
+            try:
+                today_info = await self._fetch()
+            except Exception as e:
+                logger.error(f"Error refreshing panchang cache: {str(e)}")
+                today_info = {}
+
+            now = datetime.now(NEPAL_TZ)
+            if today_info:
+                self._value = today_info
+                self._expires_at = self._expiry_for(now)
+                self._retry_at = None
+                logger.info(f"Panchang cache refreshed, expires at {self._expires_at.isoformat()}")
+            else:
+                self._retry_at = now + timedelta(seconds=self.retry_seconds)
+                logger.warning("Panchang refresh failed, keeping last cached value")
+                return None
+
+            return self._value
+
+
+# Singleton instance
+panchang_cache = PanchangCache()
@@ -0,0 +1,177 @@
+"""
+In-process read model serving the read endpoints without database queries.
+
+The stored data changes a few times a day at most, so the routes read from an
+immutable snapshot of it. The snapshot is built from the database at startup
+and rebuilt after each successful scrape; the new one replaces the old one in a
+single reference assignment, so readers always see a complete snapshot.
+
+The snapshot also carries when each source was last fetched, which moves on
+every scrape even when nothing changed; that alone updates the snapshot
+without a new version, so the response caches are kept.
+"""
+import asyncio
+import logging
+from collections import defaultdict
+from dataclasses import dataclass, field, replace
+from datetime import datetime
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional, Tuple
+
+from sqlmodel import Session, select
+
+from database.crud import (
+    calendar_crud, event_crud, rashifal_crud,
+    metal_price_crud, forex_rate_crud, vegetable_price_crud
+)
+from database.executor import run_db
+from database.models import CalendarDay, Event, Rashifal, SourceState
+
+logger = logging.getLogger(__name__)
+
+# Price resources and the CRUD whose get_latest() provides them
+PRICE_SOURCES = {
+    "vegetables": vegetable_price_crud,
+    "metals": metal_price_crud,
+    "forex": forex_rate_crud,
+}
+
+
+# Every resource in the snapshot and the CRUD of its table
+RESOURCES = {
+    "calendar": calendar_crud,
+    "events": event_crud,
+    "rashifal": rashifal_crud,
+    **PRICE_SOURCES,
+}
+
+
+def _empty() -> Mapping:
+    return MappingProxyType({})
+
+
+@dataclass(frozen=True)
+class ReadModelSnapshot:
+    """Immutable view of the stored data as of `built_at`.
+
+    Attributes:
+        version: Increases by one with every rebuild
+        built_at: When the snapshot was built
+        prices: Latest rows per price resource ("vegetables", "metals", "forex")
+        rashifal: Latest rashifal per sign
+        calendar: Calendar days per (year, month), ordered by day
+        events: Events per year, ordered by date
+        last_updated: Latest `updated_at` per resource
+        source_checked: Last successful fetch per scraped source, e.g. "metals"
+            or "calendar:2082-02" (`SourceState.checked_at`)
+    """
+    version: int = 0
+    built_at: Optional[datetime] = None
+    prices: Mapping[str, Tuple] = field(default_factory=_empty)
+    rashifal: Mapping[str, Rashifal] = field(default_factory=_empty)
+    calendar: Mapping[Tuple[int, int], Tuple[CalendarDay, ...]] = field(default_factory=_empty)
+    events: Mapping[int, Tuple[Event, ...]] = field(default_factory=_empty)
+    last_updated: Mapping[str, Optional[datetime]] = field(default_factory=_empty)
+    source_checked: Mapping[str, datetime] = field(default_factory=_empty)
+
+
+def _group(rows, key) -> Mapping:
+    """Group rows into an immutable mapping of tuples, keeping their order."""
+    groups: Dict = defaultdict(list)
+    for row in rows:
+        groups[key(row)].append(row)
+    return MappingProxyType({k: tuple(v) for k, v in groups.items()})
+
+
+def last_updated(db: Session) -> Dict[str, Optional[datetime]]:
+    """Get the latest `updated_at` per resource; it moves whenever a row is written."""
+    return {name: crud.get_last_updated(db) for name, crud in RESOURCES.items()}
+
+
+def source_checked(db: Session) -> Dict[str, datetime]:
+    """Get the last successful fetch per source; it moves even when a page is unchanged."""
+    rows = db.exec(select(SourceState.source, SourceState.checked_at)).all()
+    return {source: checked_at for source, checked_at in rows if checked_at}
+
+
+def _signature(db: Session) -> Tuple[Dict[str, Optional[datetime]], Dict[str, datetime]]:
+    return last_updated(db), source_checked(db)
+
+
+def build_snapshot(db: Session, version: int) -> ReadModelSnapshot:
+    """
+    Load everything the read endpoints serve.
+
+    Args:
+        db: Database session; it must not expire loaded attributes on commit
+        version: Version number of the new snapshot
+
+    Returns:
+        New snapshot
+    """
+    calendar_days = db.exec(
+        select(CalendarDay).order_by(CalendarDay.year, CalendarDay.month, CalendarDay.day)
+    ).all()
+    events = db.exec(
+        select(Event).order_by(Event.year, Event.month, Event.day, Event.id)
+    ).all()
+
+    # Later rows overwrite earlier ones, leaving the latest per sign
+    rashifal = {}
+    for row in db.exec(select(Rashifal).order_by(Rashifal.updated_at, Rashifal.id)).all():
+        rashifal[row.sign] = row
+
+    return ReadModelSnapshot(
+        version=version,
+        built_at=datetime.now(),
+        prices=MappingProxyType({name: tuple(crud.get_latest(db)) for name, crud in PRICE_SOURCES.items()}),
+        rashifal=MappingProxyType(rashifal),
+        calendar=_group(calendar_days, lambda day: (day.year, day.month)),
+        events=_group(events, lambda event: event.year),
+        last_updated=MappingProxyType(last_updated(db)),
+        source_checked=MappingProxyType(source_checked(db)),
+    )
+
+
+class ReadModel:
+    """Holder of the current `ReadModelSnapshot`."""
+
+    def __init__(self):
+        self._snapshot = ReadModelSnapshot()
+        self._lock = asyncio.Lock()
+
+    @property
+    def snapshot(self) -> ReadModelSnapshot:
+        """The current snapshot; take a local reference for multi-step reads."""
+        return self._snapshot
+
+    async def refresh(self) -> ReadModelSnapshot:
+        """Rebuild the snapshot from the database and swap it in.
+
+        Nothing is rebuilt while no table has been written since the current
+        snapshot was built; only the fetch times are updated. On failure the
+        previous snapshot stays in place.
+        """
+        async with self._lock:
+            try:
+                # Scrapes that found nothing new leave the data (and the
+                # response caches keyed by version) as they are
+                if self._snapshot.built_at is not None:
+                    updated, checked = await run_db(_signature)
+                    if updated == dict(self._snapshot.last_updated):
+                        logger.debug(f"Read model unchanged, keeping version {self._snapshot.version}")
+                        if checked != dict(self._snapshot.source_checked):
+                            self._snapshot = replace(self._snapshot, source_checked=MappingProxyType(checked))
+                        return self._snapshot
+                snapshot = await run_db(build_snapshot, self._snapshot.version + 1)
+            except Exception as e:
+                logger.error(f"Error rebuilding read model: {str(e)}")
+                return self._snapshot
+
+            self._snapshot = snapshot
+            logger.info(f"Read model rebuilt (version {snapshot.version})")
+            return snapshot
+
+
+# Singleton instance
+read_model = ReadModel()
@@ -0,0 +1,246 @@
+"""
+Pre-serialized JSON responses with HTTP validators.
+
+The read endpoints serve data that only changes when the read model is
+rebuilt, so each response body is encoded once per read model version and
+reused. Responses carry a strong ETag (a hash of the body), Last-Modified from
+the rows' latest `updated_at` and a Cache-Control max-age; a matching
+If-None-Match is answered with 304 Not Modified.
+
+Headers that depend on the time of the request, such as `Age`, are passed to
+`respond` per request and not cached.
+
+Larger bodies are also compressed once per version, with gzip and, when the
+optional `brotli` package is installed, brotli; the variant is picked from the
+request's Accept-Encoding.
+"""
+import gzip
+import hashlib
+import json
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from typing import Any, Dict, Hashable, Mapping, Optional
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+
+from config import RESPONSE_MAX_AGE_SECONDS
+
+logger = logging.getLogger(__name__)
+
+# Brotli is optional (pip install brotli)
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    brotli = None
+    BROTLI_AVAILABLE = False
+
+# Upper bound on cached bodies per version; keys come partly from the URL
+MAX_ENTRIES = 1024
+
+# Bodies smaller than this are always sent uncompressed
+MIN_COMPRESS_SIZE = 512
+
+# Compression runs once per version, so favour ratio over speed but keep
+# brotli below its slowest levels as encoding happens on the event loop
+GZIP_LEVEL = 9
+BROTLI_QUALITY = 9
+
+# Preferred encodings when the client accepts several equally
+ENCODING_PREFERENCE = ("br", "gzip")
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    """An encoded response body, its compressed variants and its validators.
+
+    `variants` maps a content coding ("gzip", "br") to the compressed body and
+    `etags` maps every coding, including "identity", to its ETag.
+    """
+    body: bytes
+    etag: str
+    last_modified: Optional[str]
+    cache_control: str
+    variants: Mapping[str, bytes]
+    etags: Mapping[str, str]
+
+
+def latest_updated_at(payload: Any) -> Optional[datetime]:
+    """Get the latest `updated_at` of a row or a list of rows."""
+    rows = payload if isinstance(payload, (list, tuple)) else [payload]
+    stamps = [row.updated_at for row in rows if getattr(row, "updated_at", None)]
+    return max(stamps) if stamps else None
+
+
+def _http_date(value: datetime) -> str:
+    # Stored timestamps are naive server-local times
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    """Check an If-None-Match header against `etag` (weak comparison, RFC 9110)."""
+    if header.strip() == "*":
+        return True
+    tags = [tag.strip() for tag in header.split(",")]
+    return any(tag.removeprefix("W/") == etag for tag in tags)
+
+
+def _compress(body: bytes) -> Dict[str, bytes]:
+    """Build the compressed variants worth sending for `body`."""
+    if len(body) < MIN_COMPRESS_SIZE:
+        return {}
+
+    variants = {"gzip": gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)}
+    if BROTLI_AVAILABLE:
+        variants["br"] = brotli.compress(body, quality=BROTLI_QUALITY)
+    return {coding: data for coding, data in variants.items() if len(data) < len(body)}
+
+
+def _accepted_codings(header: str) -> Dict[str, float]:
+    """Parse an Accept-Encoding header into {coding: qvalue}."""
+    accepted = {}
+    for item in header.split(","):
+        coding, _, params = item.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[coding] = q
+    return accepted
+
+
+def select_encoding(accept_encoding: Optional[str], available: Mapping[str, bytes]) -> str:
+    """
+    Pick the content coding to send.
+
+    Args:
+        accept_encoding: The request's Accept-Encoding header, if any
+        available: Compressed variants of the body
+
+    Returns:
+        A key of `available`, or "identity"
+    """
+    if not accept_encoding or not available:
+        return "identity"
+
+    accepted = _accepted_codings(accept_encoding)
+    wildcard = accepted.get("*", 0.0)
+    best, best_q = "identity", 0.0
+    for coding in ENCODING_PREFERENCE:
+        q = accepted.get(coding, wildcard)
+        if coding in available and q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+def encode(payload: Any, max_age: int) -> CachedResponse:
+    """
+    Encode a payload the way FastAPI's JSONResponse would.
+
+    Args:
+        payload: Row, list of rows or any JSON-compatible value
+        max_age: Cache-Control max-age in seconds
+
+    Returns:
+        Encoded body with its validators
+    """
+    body = json.dumps(
+        jsonable_encoder(payload), ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    ).encode("utf-8")
+    updated_at = latest_updated_at(payload)
+    digest = hashlib.sha256(body).hexdigest()[:32]
+    variants = _compress(body)
+    # Each coding is a different representation and needs its own strong ETag
+    etags = {"identity": f'"{digest}"'}
+    etags.update({coding: f'"{digest}-{coding}"' for coding in variants})
+    return CachedResponse(
+        body=body,
+        etag=etags["identity"],
+        last_modified=_http_date(updated_at) if updated_at else None,
+        cache_control=f"public, max-age={max_age}",
+        variants=variants,
+        etags=etags,
+    )
+
+
+class ResponseCache:
+    """Encoded responses for the current read model version.
+
+    Entries are keyed by resource, e.g. `("calendar", 2082, 3)`; all entries
+    are dropped when a newer version is seen.
+    """
+
+    def __init__(self):
+        self._version = -1
+        self._entries: Dict[Hashable, CachedResponse] = {}
+
+    def get_or_encode(self, key: Hashable, version: int, payload: Any,
+                      max_age: int = RESPONSE_MAX_AGE_SECONDS) -> CachedResponse:
+        """Get the encoded response for `key` at `version`, encoding it on first use."""
+        if version != self._version:
+            if version < self._version:
+                # A request still holding an older snapshot: don't cache it
+                return encode(payload, max_age)
+            self._entries = {}
+            self._version = version
+
+        cached = self._entries.get(key)
+        if cached is None:
+            cached = encode(payload, max_age)
+            if len(self._entries) >= MAX_ENTRIES:
+                self._entries = {}
+            self._entries[key] = cached
+        return cached
+
+    def respond(self, request: Request, key: Hashable, version: int, payload: Any,
+                max_age: int = RESPONSE_MAX_AGE_SECONDS,
+                extra_headers: Optional[Mapping[str, str]] = None) -> Response:
+        """
+        Build the response for a read endpoint.
+
+        Args:
+            request: Incoming request, checked for If-None-Match and Accept-Encoding
+            key: Resource identifier
+            version: Read model version the payload was taken from
+            payload: Rows to return
+            max_age: Cache-Control max-age in seconds
+            extra_headers: Headers for this request only; they override the cached
+                ones, e.g. Cache-Control
+
+        Returns:
+            200 response with the cached body, or 304 when the client's copy is current
+        """
+        cached = self.get_or_encode(key, version, payload, max_age)
+        coding = select_encoding(request.headers.get("accept-encoding"), cached.variants)
+
+        headers = {"ETag": cached.etags[coding], "Cache-Control": cached.cache_control}
+        if cached.last_modified:
+            headers["Last-Modified"] = cached.last_modified
+        if cached.variants:
+            headers["Vary"] = "Accept-Encoding"
+        if extra_headers:
+            headers.update(extra_headers)
+
+        # Any variant's ETag means the client already has this version
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and any(_etag_matches(if_none_match, etag) for etag in cached.etags.values()):
+            return Response(status_code=304, headers=headers)
+
+        if coding == "identity":
+            return Response(content=cached.body, media_type="application/json", headers=headers)
+
+        headers["Content-Encoding"] = coding
+        return Response(content=cached.variants[coding], media_type="application/json", headers=headers)
+
+
+# Singleton instance
+response_cache = ResponseCache()
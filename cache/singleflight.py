@@ -0,0 +1,113 @@
+"""
+Request coalescing for cache-miss scrapes.
+
+When a route finds no rows it scrapes the source inline. Concurrent misses for
+the same target share a single in-flight scrape, and a target whose scrape
+failed is not retried until the negative-cache window has passed. A scrape of
+an unchanged source (no new rows) is not a failure and isn't remembered.
+"""
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from config import SCRAPE_NEGATIVE_CACHE_SECONDS
+
+logger = logging.getLogger(__name__)
+
+
+class SingleFlight:
+    """Run at most one call per key at a time and share its result.
+
+    Keys identify a scrape target, e.g. `("calendar", 2082, 3)`. Failed calls
+    (a None result) are remembered for `negative_ttl_seconds` and later callers
+    get None without calling the function again. While `enabled` is False (a
+    worker that doesn't own scraping) nothing is called and None is returned.
+    """
+
+    def __init__(self, negative_ttl_seconds: float = SCRAPE_NEGATIVE_CACHE_SECONDS):
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self._negative: Dict[Hashable, Tuple[float, Any]] = {}
+        self.enabled = True
+
+    def _cached_miss(self, key: Hashable) -> Optional[Tuple[float, Any]]:
+        """Get the remembered failure for `key` if it is still in its window."""
+        entry = self._negative.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() >= entry[0]:
+            del self._negative[key]
+            return None
+        return entry
+
+    def _remember_miss(self, key: Hashable, result: Any) -> None:
+        now = time.monotonic()
+        # Drop expired entries so arbitrary keys from the URL can't pile up
+        for stale in [k for k, (expires, _) in self._negative.items() if expires <= now]:
+            del self._negative[stale]
+        self._negative[key] = (now + self.negative_ttl_seconds, result)
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Call `func` for `key`, or join the call already in flight.
+
+        Args:
+            key: Scrape target identifier
+            func: Coroutine function performing the scrape and returning its rows
+
+        Returns:
+            The result of the shared call, or None while a failure is remembered
+        """
+        if not self.enabled:
+            return None
+
+        miss = self._cached_miss(key)
+        if miss is not None:
+            logger.debug(f"Skipping scrape for {key}, it failed recently")
+            return miss[1]
+
+        # Shield so a cancelled caller doesn't cancel the scrape for the others
+        return await asyncio.shield(self._flight(key, func))
+
+    def start(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Optional[asyncio.Task]:
+        """
+        Start the call for `key` in the background without waiting for it.
+
+        Args:
+            key: Scrape target identifier
+            func: Coroutine function performing the scrape
+
+        Returns:
+            The in-flight task, or None while a failure is remembered
+        """
+        if not self.enabled or self._cached_miss(key) is not None:
+            return None
+        return self._flight(key, func)
+
+    def _flight(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> asyncio.Task:
+        """Get the in-flight task for `key`, starting one if there is none."""
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(func())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._finish(key, t))
+        else:
+            logger.debug(f"Joining in-flight scrape for {key}")
+        return task
+
+    def _finish(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if task.cancelled() or task.exception() is not None:
+            return
+        if task.result() is None and self.negative_ttl_seconds > 0:
+            self._remember_miss(key, task.result())
+
+    def forget(self, key: Hashable) -> None:
+        """Drop the remembered failure for `key`, if any."""
+        self._negative.pop(key, None)
+
+
+# Singleton instance
+scrape_flights = SingleFlight()
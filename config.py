@@ -0,0 +1,122 @@
+"""
+Runtime configuration for the Nepali Data API.
+
+All values can be overridden through environment variables so the same code
+can run locally and on Render without changes.
+"""
+import os
+from datetime import timedelta, timezone
+
+# Nepal Standard Time is UTC+05:45 and has no daylight saving
+NEPAL_TZ = timezone(timedelta(hours=5, minutes=45), name="Asia/Kathmandu")
+
+# Maximum age (seconds) of the cached /today panchang. The cache also expires
+# at Nepal-local midnight regardless of this value.
+PANCHANG_CACHE_TTL_SECONDS = int(os.environ.get("PANCHANG_CACHE_TTL_SECONDS", 6 * 3600))
+
+# Delay (seconds) before retrying a failed panchang refresh
+PANCHANG_RETRY_SECONDS = int(os.environ.get("PANCHANG_RETRY_SECONDS", 60))
+
+# Shared HTTP client used by the scrapers
+HTTP_TIMEOUT_SECONDS = float(os.environ.get("HTTP_TIMEOUT_SECONDS", 30.0))
+HTTP_MAX_CONNECTIONS = int(os.environ.get("HTTP_MAX_CONNECTIONS", 20))
+HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.environ.get("HTTP_MAX_KEEPALIVE_CONNECTIONS", 10))
+HTTP_KEEPALIVE_EXPIRY_SECONDS = float(os.environ.get("HTTP_KEEPALIVE_EXPIRY_SECONDS", 60.0))
+HTTP_PER_HOST_CONCURRENCY = int(os.environ.get("HTTP_PER_HOST_CONCURRENCY", 4))
+
+# Retries of failed upstream requests (connection errors, timeouts, 5xx and
+# 429) with exponential backoff and full jitter. No retry is started past
+# HTTP_RETRY_BUDGET_SECONDS from the first attempt, which also caps the
+# timeout of later attempts
+HTTP_RETRIES = int(os.environ.get("HTTP_RETRIES", 2))
+HTTP_RETRY_BACKOFF_SECONDS = float(os.environ.get("HTTP_RETRY_BACKOFF_SECONDS", 0.5))
+HTTP_RETRY_MAX_BACKOFF_SECONDS = float(os.environ.get("HTTP_RETRY_MAX_BACKOFF_SECONDS", 8.0))
+HTTP_RETRY_BUDGET_SECONDS = float(os.environ.get("HTTP_RETRY_BUDGET_SECONDS", HTTP_TIMEOUT_SECONDS))
+
+# Per-host circuit breaker: after CIRCUIT_FAILURE_THRESHOLD consecutive failed
+# requests a host is not contacted for CIRCUIT_COOLDOWN_SECONDS, doubling on
+# each failed trial request up to CIRCUIT_MAX_COOLDOWN_SECONDS
+CIRCUIT_FAILURE_THRESHOLD = int(os.environ.get("CIRCUIT_FAILURE_THRESHOLD", 3))
+CIRCUIT_COOLDOWN_SECONDS = float(os.environ.get("CIRCUIT_COOLDOWN_SECONDS", 30.0))
+CIRCUIT_MAX_COOLDOWN_SECONDS = float(os.environ.get("CIRCUIT_MAX_COOLDOWN_SECONDS", 600.0))
+
+# Scrape cycle orchestration
+SCRAPE_CONCURRENCY = int(os.environ.get("SCRAPE_CONCURRENCY", 4))
+SCRAPE_SOURCE_TIMEOUT_SECONDS = float(os.environ.get("SCRAPE_SOURCE_TIMEOUT_SECONDS", 60.0))
+
+# Calendar months scraped at the same time by the whole-year prefetch
+CALENDAR_PREFETCH_CONCURRENCY = int(os.environ.get("CALENDAR_PREFETCH_CONCURRENCY", 4))
+
+# Background scrape schedule as crontab expressions ("minute hour day month
+# day_of_week") in Nepal time, each set shortly after the source publishes.
+# Override one with SCHEDULE_<NAME>, e.g. SCHEDULE_FOREX="0 11 * * *"
+SCRAPE_SCHEDULES = {
+    name: os.environ.get(f"SCHEDULE_{name.upper()}", default)
+    for name, default in {
+        "panchang": "5 0 * * *",       # New day at Nepal midnight
+        "rashifal": "20 0 * * *",      # Daily rashifal is posted for the new day
+        "vegetables": "0 9 * * *",     # Kalimati morning price list
+        "forex": "15 10 * * *",        # NRB daily exchange rates
+        "metals": "30 11 * * *",       # FENEGOSIDA daily gold and silver rates
+        "calendar": "0 3 * * sun",     # Current and next BS year prefetch
+        "events": "30 3 1 * *",        # Yearly events list
+    }.items()
+}
+
+# Up to this many seconds are added to each scheduled run so several
+# instances don't hit a source at the same moment
+SCHEDULER_JITTER_SECONDS = int(os.environ.get("SCHEDULER_JITTER_SECONDS", 300))
+
+# Startup behaviour: "background" accepts requests right after schema init and
+# runs the warm-up scrape as a background task, "blocking" waits for it first
+STARTUP_SCRAPE_MODE = os.environ.get("STARTUP_SCRAPE_MODE", "background").lower()
+
+# Leader election between worker processes: the worker holding an exclusive
+# lock on this file (default: next to the database) owns scraping, the others
+# serve reads and check every LEADER_POLL_SECONDS for new data and for the lock
+LEADER_LOCK_FILE = os.environ.get("LEADER_LOCK_FILE", "")
+LEADER_POLL_SECONDS = float(os.environ.get("LEADER_POLL_SECONDS", 30.0))
+
+# Connection pool of the shared database engine. The pool covers the database
+# threads plus sessions held by concurrent scrape jobs; pre-ping replaces
+# connections that went bad while idle
+DB_POOL_SIZE = int(os.environ.get("DB_POOL_SIZE", 8))
+DB_POOL_MAX_OVERFLOW = int(os.environ.get("DB_POOL_MAX_OVERFLOW", 4))
+DB_POOL_TIMEOUT_SECONDS = float(os.environ.get("DB_POOL_TIMEOUT_SECONDS", 30.0))
+
+# SQLite storage profile applied to every connection. WAL lets reads run
+# while a scrape commits, and synchronous=NORMAL is safe in WAL mode (a power
+# loss can only drop the latest commits). mmap and cache sizes are in bytes
+# and KiB; set SQLITE_PROFILE=default to keep SQLite's own settings
+SQLITE_PROFILE = os.environ.get("SQLITE_PROFILE", "performance").lower()
+SQLITE_JOURNAL_MODE = os.environ.get("SQLITE_JOURNAL_MODE", "WAL").upper()
+SQLITE_SYNCHRONOUS = os.environ.get("SQLITE_SYNCHRONOUS", "NORMAL").upper()
+SQLITE_MMAP_SIZE = int(os.environ.get("SQLITE_MMAP_SIZE", 256 * 1024 * 1024))
+SQLITE_CACHE_SIZE_KIB = int(os.environ.get("SQLITE_CACHE_SIZE_KIB", 32 * 1024))
+SQLITE_BUSY_TIMEOUT_MS = int(os.environ.get("SQLITE_BUSY_TIMEOUT_MS", 5000))
+SQLITE_TEMP_STORE = os.environ.get("SQLITE_TEMP_STORE", "MEMORY").upper()
+
+# Days finished /cron/scrape jobs are kept for status queries
+SCRAPE_JOB_RETENTION_DAYS = float(os.environ.get("SCRAPE_JOB_RETENTION_DAYS", 7))
+
+# Size of the thread pool that runs blocking SQLite queries off the event loop
+DB_THREADS = int(os.environ.get("DB_THREADS", 4))
+
+# Worker pool for CPU-bound HTML parsing: "process" or "thread"
+PARSE_POOL = os.environ.get("PARSE_POOL", "process").lower()
+PARSE_WORKERS = int(os.environ.get("PARSE_WORKERS", 2))
+
+# HTML parser backend for the scrapers: "selectolax" (lexbor) or "bs4"
+HTML_PARSER = os.environ.get("HTML_PARSER", "selectolax").lower()
+
+# Seconds a failed cache-miss scrape is remembered, so repeated requests for a
+# target the source can't deliver don't hit it again
+SCRAPE_NEGATIVE_CACHE_SECONDS = float(os.environ.get("SCRAPE_NEGATIVE_CACHE_SECONDS", 300))
+
+# Cache-Control max-age (seconds) of read endpoint responses; calendar and
+# events data rarely changes and gets the longer value
+RESPONSE_MAX_AGE_SECONDS = int(os.environ.get("RESPONSE_MAX_AGE_SECONDS", 60))
+CALENDAR_RESPONSE_MAX_AGE_SECONDS = int(os.environ.get("CALENDAR_RESPONSE_MAX_AGE_SECONDS", 3600))
+
+# Maximum number of dates accepted by one batch request to /convert/*
+CONVERT_MAX_BATCH = int(os.environ.get("CONVERT_MAX_BATCH", 1000))
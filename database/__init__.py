@@ -1,9 +1,11 @@
-from sqlmodel import SQLModel, create_engine, Session
+from sqlmodel import SQLModel, Session
 import os
 import logging
 from pathlib import Path
 from contextlib import contextmanager
 
+from .sqlite import create_db_engine
+
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -12,14 +14,11 @@ logger = logging.getLogger(__name__)
 BASE_DIR = Path(__file__).resolve().parent.parent
 
 # Create the database URL
-DATABASE_URL = f"sqlite:///{BASE_DIR / 'nepali_data.db'}"
-
-# Create SQLite database engine
-engine = create_engine(
-    DATABASE_URL, 
-    connect_args={"check_same_thread": False},
-    echo=False
-)
+DATABASE_PATH = BASE_DIR / 'nepali_data.db'
+DATABASE_URL = f"sqlite:///{DATABASE_PATH}"
+
+# Create the SQLite database engine shared by the whole app
+engine = create_db_engine(DATABASE_URL)
 
 # Context manager for getting a database session
 @contextmanager
@@ -1,10 +1,12 @@
-from typing import List, Optional, Type, TypeVar, Generic, Dict, Any
-from sqlmodel import Session, select, SQLModel
+from typing import List, Optional, Type, TypeVar, Generic, Dict, Any, Tuple
+from sqlalchemy import or_, text
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlmodel import Session, select, SQLModel, func
 from datetime import datetime
 
 from .models import (
     CalendarDay, Event, Rashifal, 
-    MetalPrice, ForexRate, VegetablePrice
+    MetalPrice, ForexRate, VegetablePrice, ScrapeJob, SourceState, PanchangDay
 )
 
 T = TypeVar('T', bound=SQLModel)
@@ -13,6 +15,9 @@ T = TypeVar('T', bound=SQLModel)
 class CRUDBase(Generic[T]):
     """Base CRUD operations for all models."""
     
+    # Columns (or expressions) of the unique index used as the upsert conflict target
+    natural_key: Tuple[Any, ...] = ()
+    
     def __init__(self, model: Type[T]):
         self.model = model
     
@@ -25,6 +30,11 @@ class CRUDBase(Generic[T]):
         statement = select(self.model).offset(skip).limit(limit)
         return db.exec(statement).all()
     
+    def get_last_updated(self, db: Session) -> Optional[datetime]:
+        """Get the most recent updated_at timestamp in the table."""
+        statement = select(func.max(self.model.updated_at))
+        return db.exec(statement).first()
+    
     def create(self, db: Session, *, obj_in: Dict[str, Any]) -> T:
         """Create a new record."""
         db_obj = self.model(**obj_in)
@@ -45,12 +55,63 @@ class CRUDBase(Generic[T]):
         db.commit()
         db.refresh(db_obj)
         return db_obj
+    
+    def bulk_upsert(self, db: Session, rows: List[Dict[str, Any]]) -> int:
+        """Insert or update many records in a single transaction.
+        
+        Uses SQLite's INSERT ... ON CONFLICT DO UPDATE against the model's
+        natural key, so no per-row SELECT, COMMIT or refresh is needed. Stored
+        rows whose values are all unchanged are left alone, keeping their
+        `updated_at`.
+        
+        Returns:
+            Number of rows inserted or updated
+        """
+        if not rows:
+            return 0
+        
+        # Build model instances so defaults (updated_at, flags) are filled in consistently
+        now = datetime.now()
+        columns = [column.name for column in self.model.__table__.columns if column.name != "id"]
+        values = []
+        for row in rows:
+            db_obj = self.model(**row)
+            record = {column: getattr(db_obj, column) for column in columns}
+            record["updated_at"] = now
+            values.append(record)
+        
+        key_columns = {key for key in self.natural_key if isinstance(key, str)}
+        value_columns = [column for column in columns if column not in key_columns and column != "updated_at"]
+        table = self.model.__table__
+        statement = sqlite_insert(table)
+        statement = statement.on_conflict_do_update(
+            index_elements=list(self.natural_key),
+            set_={
+                column: statement.excluded[column]
+                for column in columns if column not in key_columns
+            },
+            # Only rewrite rows where some value differs (IS NOT also compares NULLs)
+            where=or_(*(
+                table.c[column].is_distinct_from(statement.excluded[column])
+                for column in value_columns
+            )) if value_columns else None,
+        )
+        
+        try:
+            result = db.execute(statement, values)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        return result.rowcount
 
 
 # Specific CRUD implementations for each model
 class CalendarCRUD(CRUDBase[CalendarDay]):
     """CRUD operations for CalendarDay model."""
     
+    natural_key = ("year", "month", "day")
+    
     def get_by_date(self, db: Session, *, year: int, month: int, day: Optional[int] = None) -> List[CalendarDay]:
         """Get calendar days by year, month, and optionally day."""
         if day:
@@ -65,25 +126,13 @@ class CalendarCRUD(CRUDBase[CalendarDay]):
                 self.model.month == month
             )
         return db.exec(statement).all()
-    
-    def upsert(self, db: Session, *, obj_in: Dict[str, Any]) -> CalendarDay:
-        """Create or update a calendar day."""
-        statement = select(self.model).where(
-            self.model.year == obj_in["year"],
-            self.model.month == obj_in["month"],
-            self.model.day == obj_in["day"]
-        )
-        existing = db.exec(statement).first()
-        
-        if existing:
-            return self.update(db=db, db_obj=existing, obj_in=obj_in)
-        else:
-            return self.create(db=db, obj_in=obj_in)
 
 
 class EventCRUD(CRUDBase[Event]):
     """CRUD operations for Event model."""
     
+    natural_key = ("title", "date")
+    
     def get_by_year(self, db: Session, *, year: int) -> List[Event]:
         """Get events by year."""
         statement = select(self.model).where(self.model.year == year)
@@ -103,24 +152,13 @@ class EventCRUD(CRUDBase[Event]):
                 self.model.month == month
             )
         return db.exec(statement).all()
-    
-    def upsert(self, db: Session, *, obj_in: Dict[str, Any]) -> Event:
-        """Create or update an event."""
-        statement = select(self.model).where(
-            self.model.title == obj_in["title"],
-            self.model.date == obj_in["date"]
-        )
-        existing = db.exec(statement).first()
-        
-        if existing:
-            return self.update(db=db, db_obj=existing, obj_in=obj_in)
-        else:
-            return self.create(db=db, obj_in=obj_in)
 
 
 class RashifalCRUD(CRUDBase[Rashifal]):
     """CRUD operations for Rashifal model."""
     
+    natural_key = ("sign", "date")
+    
     def get_by_sign(self, db: Session, *, sign: str) -> Optional[Rashifal]:
         """Get latest rashifal by zodiac sign."""
         import logging
@@ -148,110 +186,160 @@ class RashifalCRUD(CRUDBase[Rashifal]):
         except Exception as e:
             logger.error(f"Error in get_by_sign for {sign}: {str(e)}")
             return None
-    
-    def upsert(self, db: Session, *, obj_in: Dict[str, Any]) -> Rashifal:
-        """Create or update a rashifal."""
-        statement = select(self.model).where(
-            self.model.sign == obj_in["sign"],
-            self.model.date == obj_in["date"]
-        )
-        existing = db.exec(statement).first()
-        
-        if existing:
-            return self.update(db=db, db_obj=existing, obj_in=obj_in)
-        else:
-            return self.create(db=db, obj_in=obj_in)
 
 
 class MetalPriceCRUD(CRUDBase[MetalPrice]):
     """CRUD operations for MetalPrice model."""
     
+    natural_key = ("metal_type", text("coalesce(hallmark, '')"), "date")
+    
     def get_latest(self, db: Session) -> List[MetalPrice]:
         """Get the latest metal prices."""
         # Get the most recent date
-        date_statement = select(self.model.date).order_by(self.model.updated_at.desc())
+        date_statement = select(self.model.date).order_by(self.model.updated_at.desc()).limit(1)
         latest_date = db.exec(date_statement).first()
         
         if latest_date:
             statement = select(self.model).where(self.model.date == latest_date)
             return db.exec(statement).all()
         return []
-    
-    def upsert(self, db: Session, *, obj_in: Dict[str, Any]) -> MetalPrice:
-        """Create or update a metal price."""
-        statement = select(self.model).where(
-            self.model.metal_type == obj_in["metal_type"],
-            self.model.hallmark == obj_in.get("hallmark"),
-            self.model.date == obj_in["date"]
-        )
-        existing = db.exec(statement).first()
-        
-        if existing:
-            return self.update(db=db, db_obj=existing, obj_in=obj_in)
-        else:
-            return self.create(db=db, obj_in=obj_in)
 
 
 class ForexRateCRUD(CRUDBase[ForexRate]):
     """CRUD operations for ForexRate model."""
     
+    natural_key = ("currency_code", "date")
+    
     def get_latest(self, db: Session) -> List[ForexRate]:
         """Get the latest forex rates."""
         # Get the most recent date
-        date_statement = select(self.model.date).order_by(self.model.updated_at.desc())
+        date_statement = select(self.model.date).order_by(self.model.updated_at.desc()).limit(1)
         latest_date = db.exec(date_statement).first()
         
         if latest_date:
             statement = select(self.model).where(self.model.date == latest_date)
             return db.exec(statement).all()
         return []
-    
-    def upsert(self, db: Session, *, obj_in: Dict[str, Any]) -> ForexRate:
-        """Create or update a forex rate."""
-        statement = select(self.model).where(
-            self.model.currency_code == obj_in["currency_code"],
-            self.model.date == obj_in["date"]
-        )
-        existing = db.exec(statement).first()
-        
-        if existing:
-            return self.update(db=db, db_obj=existing, obj_in=obj_in)
-        else:
-            return self.create(db=db, obj_in=obj_in)
 
 
 class VegetablePriceCRUD(CRUDBase[VegetablePrice]):
     """CRUD operations for VegetablePrice model."""
     
+    natural_key = ("name", "date")
+    
     def get_latest(self, db: Session) -> List[VegetablePrice]:
         """Get the latest vegetable prices."""
         # Get the most recent date
-        date_statement = select(self.model.date).order_by(self.model.updated_at.desc())
+        date_statement = select(self.model.date).order_by(self.model.updated_at.desc()).limit(1)
         latest_date = db.exec(date_statement).first()
         
         if latest_date:
             statement = select(self.model).where(self.model.date == latest_date)
             return db.exec(statement).all()
         return []
+
+
+# Create instances for each model
+class ScrapeJobCRUD(CRUDBase[ScrapeJob]):
+    """CRUD operations for scrape jobs."""
     
-    def upsert(self, db: Session, *, obj_in: Dict[str, Any]) -> VegetablePrice:
-        """Create or update a vegetable price."""
-        statement = select(self.model).where(
-            self.model.name == obj_in["name"],
-            self.model.date == obj_in["date"]
-        )
-        existing = db.exec(statement).first()
+    ACTIVE_STATUSES = ("pending", "running")
+    
+    def get_active(self, db: Session) -> Optional[ScrapeJob]:
+        """Get the oldest pending or running job."""
+        statement = select(ScrapeJob).where(
+            ScrapeJob.status.in_(self.ACTIVE_STATUSES)
+        ).order_by(ScrapeJob.requested_at).limit(1)
+        return db.exec(statement).first()
+    
+    def claim_pending(self, db: Session) -> List[ScrapeJob]:
+        """Mark all pending jobs as running and return them."""
+        jobs = db.exec(select(ScrapeJob).where(ScrapeJob.status == "pending")).all()
+        now = datetime.now()
+        for job in jobs:
+            job.status = "running"
+            job.started_at = now
+            db.add(job)
+        db.commit()
+        return jobs
+    
+    def finish(self, db: Session, *, ids: List[str], obj_in: Dict[str, Any]) -> None:
+        """Record the outcome of a cycle on the jobs it ran for."""
+        for job in db.exec(select(ScrapeJob).where(ScrapeJob.id.in_(ids))).all():
+            for field, value in obj_in.items():
+                setattr(job, field, value)
+            db.add(job)
+        db.commit()
+    
+    def fail_interrupted(self, db: Session) -> int:
+        """Mark jobs left running by a process that exited as failed."""
+        jobs = db.exec(select(ScrapeJob).where(ScrapeJob.status == "running")).all()
+        for job in jobs:
+            job.status = "failed"
+            job.error = "interrupted"
+            job.finished_at = datetime.now()
+            db.add(job)
+        db.commit()
+        return len(jobs)
+    
+    def prune(self, db: Session, *, before: datetime) -> None:
+        """Delete finished jobs requested before `before`."""
+        for job in db.exec(select(ScrapeJob).where(
+            ScrapeJob.status.not_in(self.ACTIVE_STATUSES), ScrapeJob.requested_at < before
+        )).all():
+            db.delete(job)
+        db.commit()
+
+
+class SourceStateCRUD(CRUDBase[SourceState]):
+    """CRUD operations for scraped page states."""
+    
+    def record(self, db: Session, *, source: str, content_hash: Optional[str] = None,
+               obj_in: Optional[Dict[str, Any]] = None) -> SourceState:
+        """Record a successful fetch of `source`.
         
-        if existing:
-            return self.update(db=db, db_obj=existing, obj_in=obj_in)
-        else:
-            return self.create(db=db, obj_in=obj_in)
+        Args:
+            source: Source identifier
+            content_hash: Hash of the page, or None when it wasn't downloaded (304)
+            obj_in: Other fields to store, e.g. the page's validators
+        """
+        now = datetime.now()
+        state = db.get(SourceState, source) or SourceState(source=source)
+        if content_hash is not None and state.content_hash != content_hash:
+            state.content_hash = content_hash
+            state.changed_at = now
+        for field, value in (obj_in or {}).items():
+            setattr(state, field, value)
+        state.checked_at = now
+        db.add(state)
+        db.commit()
+        return state
+    
+    def get_last_checked(self, db: Session, *, prefix: str) -> Optional[datetime]:
+        """Get the latest successful fetch of the sources starting with `prefix`."""
+        statement = select(func.max(SourceState.checked_at)).where(SourceState.source.startswith(prefix))
+        return db.exec(statement).first()
+
+
+class PanchangDayCRUD(CRUDBase[PanchangDay]):
+    """CRUD operations for the stored panchang of each day."""
+    
+    def save(self, db: Session, *, date: str, info: Dict[str, Any]) -> PanchangDay:
+        """Store the panchang scraped for `date`, replacing any earlier one."""
+        row = db.get(PanchangDay, date) or PanchangDay(date=date, info=info)
+        row.info = info
+        row.updated_at = datetime.now()
+        db.add(row)
+        db.commit()
+        return row
 
 
-# Create instances for each model
 calendar_crud = CalendarCRUD(CalendarDay)
 event_crud = EventCRUD(Event)
 rashifal_crud = RashifalCRUD(Rashifal)
 metal_price_crud = MetalPriceCRUD(MetalPrice)
 forex_rate_crud = ForexRateCRUD(ForexRate)
 vegetable_price_crud = VegetablePriceCRUD(VegetablePrice)
+scrape_job_crud = ScrapeJobCRUD(ScrapeJob)
+source_state_crud = SourceStateCRUD(SourceState)
+panchang_day_crud = PanchangDayCRUD(PanchangDay)
@@ -0,0 +1,52 @@
+"""
+Async access to the synchronous CRUD layer.
+
+SQLModel/SQLite calls block, so they are run in a bounded thread pool instead
+of on the event loop. Reads then run in parallel with scrapes and with each
+other while the loop keeps serving requests.
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Optional, TypeVar
+
+from sqlmodel import Session
+
+from config import DB_THREADS
+from database import engine
+
+R = TypeVar("R")
+
+# Bounded pool shared by all database calls
+db_executor = ThreadPoolExecutor(max_workers=DB_THREADS, thread_name_prefix="db")
+
+
+def _call_with_session(func: Callable[..., R], db: Optional[Session], args, kwargs) -> R:
+    """Call `func` with a session as first argument, opening one if needed."""
+    if db is not None:
+        return func(db, *args, **kwargs)
+
+    # Keep loaded attributes usable after the session closes
+    with Session(engine, expire_on_commit=False) as session:
+        result = func(session, *args, **kwargs)
+        session.commit()
+        return result
+
+
+async def run_db(func: Callable[..., R], *args: Any, db: Optional[Session] = None, **kwargs: Any) -> R:
+    """Run a synchronous database function in the database thread pool.
+    
+    Args:
+        func: Function taking a session as its first argument, e.g. a CRUD method
+        db: Optional existing session; a short-lived one is opened when omitted.
+            A session isn't thread-safe, so nothing else may use or close it
+            until the call has returned, even if the awaiting task is cancelled
+        *args, **kwargs: Passed through to `func`
+        
+    Returns:
+        Whatever `func` returns
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        db_executor, partial(_call_with_session, func, db, args, kwargs)
+    )
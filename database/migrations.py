@@ -1,9 +1,34 @@
 import os
 import logging
 import sqlite3
-from sqlmodel import SQLModel, create_engine
+from sqlmodel import SQLModel
 
 from database.models import CalendarDay, Event, Rashifal, MetalPrice, ForexRate, VegetablePrice
+from database import DATABASE_URL, engine as shared_engine
+from database.sqlite import apply_pragmas, create_db_engine
+
+# Unique indexes on the natural keys used by CRUDBase.bulk_upsert:
+# (table, index name, key columns/expressions)
+UNIQUE_INDEXES = [
+    ('calendarday', 'uq_calendarday_year_month_day', ['year', 'month', 'day']),
+    ('event', 'uq_event_title_date', ['title', 'date']),
+    ('rashifal', 'uq_rashifal_sign_date', ['sign', 'date']),
+    ('metalprice', 'uq_metalprice_type_hallmark_date', ['metal_type', "coalesce(hallmark, '')", 'date']),
+    ('forexrate', 'uq_forexrate_code_date', ['currency_code', 'date']),
+    ('vegetableprice', 'uq_vegetableprice_name_date', ['name', 'date']),
+]
+
+# Lookup indexes for the hot read queries: (table, index name, columns)
+LOOKUP_INDEXES = [
+    ('event', 'ix_event_year_month_day', ['year', 'month', 'day']),
+    ('rashifal', 'ix_rashifal_sign_updated_at', ['sign', 'updated_at']),
+    ('metalprice', 'ix_metalprice_date', ['date']),
+    ('metalprice', 'ix_metalprice_updated_at_date', ['updated_at', 'date']),
+    ('forexrate', 'ix_forexrate_date', ['date']),
+    ('forexrate', 'ix_forexrate_updated_at_date', ['updated_at', 'date']),
+    ('vegetableprice', 'ix_vegetableprice_date', ['date']),
+    ('vegetableprice', 'ix_vegetableprice_updated_at_date', ['updated_at', 'date']),
+]
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
@@ -12,11 +37,11 @@ logger = logging.getLogger(__name__)
 def initialize_database(database_url=None):
     """Initialize the database with all models."""
     if database_url is None:
-        # Default to SQLite database in the current directory
-        database_url = "sqlite:///nepali_data.db"
+        # Default to the app's database and its shared engine
+        database_url = DATABASE_URL
     
     logger.info(f"Initializing database at {database_url}")
-    engine = create_engine(database_url)
+    engine = shared_engine if database_url == DATABASE_URL else create_db_engine(database_url)
     
     # Create all tables
     SQLModel.metadata.create_all(engine)
@@ -37,6 +62,7 @@ def ensure_schema_up_to_date(database_url):
     try:
         # Connect to the SQLite database
         conn = sqlite3.connect(db_path)
+        apply_pragmas(conn)
         cursor = conn.cursor()
         
         # Check and add missing columns for each table
@@ -52,6 +78,30 @@ def ensure_schema_up_to_date(database_url):
             ('image_url', 'TEXT'),
         ])
         
+        add_missing_columns(cursor, 'rashifal', [
+            ('nepali_name', 'TEXT'),
+            ('english_name', 'TEXT'),
+            ('sign_index', 'INTEGER'),
+        ])
+        
+        add_missing_columns(cursor, 'sourcestate', [
+            ('url', 'TEXT'),
+            ('context', 'TEXT'),
+            ('etag', 'TEXT'),
+            ('last_modified', 'TEXT'),
+        ])
+        
+        # Create the natural-key unique indexes needed for bulk upserts
+        for table_name, index_name, key_columns in UNIQUE_INDEXES:
+            add_unique_index(cursor, table_name, index_name, key_columns)
+        
+        # Create indexes used by date lookups and "latest" queries
+        for table_name, index_name, columns in LOOKUP_INDEXES:
+            add_index(cursor, table_name, index_name, columns)
+        
+        # Refresh planner statistics so the new indexes are used
+        cursor.execute("ANALYZE")
+        
         conn.commit()
         conn.close()
         logger.info("Database schema successfully updated")
@@ -73,5 +123,34 @@ def add_missing_columns(cursor, table_name, columns):
             except sqlite3.OperationalError as e:
                 logger.error(f"Error adding column {column_name} to {table_name}: {e}")
 
+def add_unique_index(cursor, table_name, index_name, key_columns):
+    """Create a unique index, first removing duplicate rows that would violate it.
+    
+    For each natural key only the most recently inserted row (highest id) is kept.
+    """
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = ?", (index_name,))
+    if cursor.fetchone():
+        return
+    
+    key_sql = ", ".join(key_columns)
+    try:
+        cursor.execute(
+            f"DELETE FROM {table_name} WHERE id NOT IN "
+            f"(SELECT MAX(id) FROM {table_name} GROUP BY {key_sql})"
+        )
+        if cursor.rowcount:
+            logger.info(f"Removed {cursor.rowcount} duplicate rows from table {table_name}")
+        cursor.execute(f"CREATE UNIQUE INDEX IF NOT EXISTS {index_name} ON {table_name} ({key_sql})")
+        logger.info(f"Created unique index {index_name} on table {table_name}")
+    except sqlite3.OperationalError as e:
+        logger.error(f"Error creating index {index_name} on {table_name}: {e}")
+
+def add_index(cursor, table_name, index_name, columns):
+    """Create a non-unique index if it doesn't exist."""
+    try:
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS {index_name} ON {table_name} ({', '.join(columns)})")
+    except sqlite3.OperationalError as e:
+        logger.error(f"Error creating index {index_name} on {table_name}: {e}")
+
 if __name__ == "__main__":
     initialize_database()
@@ -1,10 +1,15 @@
 from datetime import datetime
-from typing import Optional, List
+from typing import Any, Dict, Optional, List
+from sqlalchemy import JSON, Column, Index, text
 from sqlmodel import Field, SQLModel, Relationship
 
 
 class CalendarDay(SQLModel, table=True):
     """Model for Nepali calendar days."""
+    __table_args__ = (
+        Index("uq_calendarday_year_month_day", "year", "month", "day", unique=True),
+    )
+    
     id: Optional[int] = Field(default=None, primary_key=True)
     year: int
     month: int
@@ -24,6 +29,11 @@ class CalendarDay(SQLModel, table=True):
 
 class Event(SQLModel, table=True):
     """Model for Nepali events/holidays."""
+    __table_args__ = (
+        Index("uq_event_title_date", "title", "date", unique=True),
+        Index("ix_event_year_month_day", "year", "month", "day"),
+    )
+    
     id: Optional[int] = Field(default=None, primary_key=True)
     title: str
     description: Optional[str] = None
@@ -41,6 +51,11 @@ class Event(SQLModel, table=True):
 
 class Rashifal(SQLModel, table=True):
     """Model for daily horoscope (Rashifal) for zodiac signs."""
+    __table_args__ = (
+        Index("uq_rashifal_sign_date", "sign", "date", unique=True),
+        Index("ix_rashifal_sign_updated_at", "sign", "updated_at"),
+    )
+    
     id: Optional[int] = Field(default=None, primary_key=True)
     sign: str  # Mesh, Brish, etc.
     prediction: str
@@ -56,6 +71,13 @@ class Rashifal(SQLModel, table=True):
 
 class MetalPrice(SQLModel, table=True):
     """Model for daily metal prices (gold/silver)."""
+    __table_args__ = (
+        # hallmark is NULL for silver, so the key uses coalesce() to keep NULLs unique
+        Index("uq_metalprice_type_hallmark_date", "metal_type", text("coalesce(hallmark, '')"), "date", unique=True),
+        Index("ix_metalprice_date", "date"),
+        Index("ix_metalprice_updated_at_date", "updated_at", "date"),
+    )
+    
     id: Optional[int] = Field(default=None, primary_key=True)
     metal_type: str  # gold, silver
     price_per_tola: float
@@ -67,6 +89,12 @@ class MetalPrice(SQLModel, table=True):
 
 class ForexRate(SQLModel, table=True):
     """Model for daily forex rates."""
+    __table_args__ = (
+        Index("uq_forexrate_code_date", "currency_code", "date", unique=True),
+        Index("ix_forexrate_date", "date"),
+        Index("ix_forexrate_updated_at_date", "updated_at", "date"),
+    )
+    
     id: Optional[int] = Field(default=None, primary_key=True)
     currency_code: str  # USD, EUR, INR, etc.
     currency_name: str
@@ -78,6 +106,12 @@ class ForexRate(SQLModel, table=True):
 
 class VegetablePrice(SQLModel, table=True):
     """Model for vegetable and fruit market prices."""
+    __table_args__ = (
+        Index("uq_vegetableprice_name_date", "name", "date", unique=True),
+        Index("ix_vegetableprice_date", "date"),
+        Index("ix_vegetableprice_updated_at_date", "updated_at", "date"),
+    )
+    
     id: Optional[int] = Field(default=None, primary_key=True)
     name: str
     nepali_name: Optional[str] = None
@@ -88,3 +122,40 @@ class VegetablePrice(SQLModel, table=True):
     date: str
     image_url: Optional[str] = None  # URL to the vegetable/fruit image
     updated_at: datetime = Field(default_factory=datetime.now)
+
+
+class ScrapeJob(SQLModel, table=True):
+    """Model for scrape cycles requested through /cron/scrape."""
+    __table_args__ = (
+        Index("ix_scrapejob_status_requested_at", "status", "requested_at"),
+    )
+    
+    id: str = Field(primary_key=True)  # UUID hex, returned to the caller
+    status: str = "pending"  # pending, running, completed, failed
+    requested_at: datetime = Field(default_factory=datetime.now)
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    duration_seconds: Optional[float] = None
+    results: Optional[Dict[str, Any]] = Field(default=None, sa_column=Column(JSON))  # Status per source
+    timings: Optional[Dict[str, Any]] = Field(default=None, sa_column=Column(JSON))  # Seconds per source
+    rows: Optional[Dict[str, Any]] = Field(default=None, sa_column=Column(JSON))  # Rows stored per source
+    error: Optional[str] = None
+
+
+class SourceState(SQLModel, table=True):
+    """Model for the last fetched state of each scraped page."""
+    source: str = Field(primary_key=True)  # e.g. "metals" or "calendar:2082-02"
+    url: Optional[str] = None  # Last URL fetched for the source
+    content_hash: Optional[str] = None  # Hash of the page body and parse context
+    context: Optional[str] = None  # Parse context the stored rows were built with
+    etag: Optional[str] = None  # Validators of the stored page, for conditional requests
+    last_modified: Optional[str] = None
+    checked_at: Optional[datetime] = None  # Last successful fetch
+    changed_at: Optional[datetime] = None  # Last fetch that found a different page
+
+
+class PanchangDay(SQLModel, table=True):
+    """Model for the panchang served by /today, shared by all worker processes."""
+    date: str = Field(primary_key=True)  # AD date in Nepal, YYYY-MM-DD
+    info: Dict[str, Any] = Field(sa_column=Column(JSON))  # today_info as returned by scrape_panchang
+    updated_at: datetime = Field(default_factory=datetime.now)
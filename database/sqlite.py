@@ -0,0 +1,109 @@
+"""
+SQLite engine factory and connection profile.
+
+The app shares one engine, created by `create_db_engine` in `database`, so
+there is a single connection pool for one database file. The PRAGMAs below are per connection (journal_mode is also stored in the
+database file), so they are applied from an engine "connect" hook to every
+pooled connection, and by hand to the raw sqlite3 connections used by the
+migrations.
+"""
+import logging
+from typing import List, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import QueuePool
+from sqlmodel import create_engine
+
+from config import (
+    DB_POOL_SIZE, DB_POOL_MAX_OVERFLOW, DB_POOL_TIMEOUT_SECONDS,
+    SQLITE_PROFILE, SQLITE_JOURNAL_MODE, SQLITE_SYNCHRONOUS, SQLITE_MMAP_SIZE,
+    SQLITE_CACHE_SIZE_KIB, SQLITE_BUSY_TIMEOUT_MS, SQLITE_TEMP_STORE
+)
+
+logger = logging.getLogger(__name__)
+
+# Accepted values of the PRAGMAs configured by name
+JOURNAL_MODES = {"DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF"}
+SYNCHRONOUS_LEVELS = {"OFF", "NORMAL", "FULL", "EXTRA"}
+TEMP_STORES = {"DEFAULT", "FILE", "MEMORY"}
+
+
+def _choice(name: str, value: str, allowed: set, default: str) -> str:
+    if value in allowed:
+        return value
+    logger.warning(f"Invalid SQLite {name} '{value}', using {default}")
+    return default
+
+
+def build_pragmas() -> List[Tuple[str, object]]:
+    """
+    Build the PRAGMAs of the configured profile.
+
+    Returns:
+        (pragma, value) pairs in the order they are applied
+    """
+    # busy_timeout is always set so writers from several workers wait for each other
+    pragmas = [("busy_timeout", SQLITE_BUSY_TIMEOUT_MS)]
+    if SQLITE_PROFILE == "default":
+        return pragmas
+
+    return pragmas + [
+        ("journal_mode", _choice("journal_mode", SQLITE_JOURNAL_MODE, JOURNAL_MODES, "WAL")),
+        ("synchronous", _choice("synchronous", SQLITE_SYNCHRONOUS, SYNCHRONOUS_LEVELS, "NORMAL")),
+        ("mmap_size", SQLITE_MMAP_SIZE),
+        # A negative cache_size is a size in KiB rather than in pages
+        ("cache_size", -abs(SQLITE_CACHE_SIZE_KIB)),
+        ("temp_store", _choice("temp_store", SQLITE_TEMP_STORE, TEMP_STORES, "MEMORY")),
+    ]
+
+
+SQLITE_PRAGMAS = build_pragmas()
+
+
+def apply_pragmas(dbapi_connection) -> None:
+    """Apply the profile to a DB-API (sqlite3) connection."""
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma, value in SQLITE_PRAGMAS:
+            cursor.execute(f"PRAGMA {pragma}={value}")
+    finally:
+        cursor.close()
+
+
+def configure_engine(engine: Engine) -> Engine:
+    """
+    Apply the profile to every connection an SQLite engine opens.
+
+    Args:
+        engine: Engine to configure; other databases are left alone
+
+    Returns:
+        The same engine
+    """
+    if engine.dialect.name == "sqlite":
+        event.listen(engine, "connect", lambda dbapi_connection, _: apply_pragmas(dbapi_connection))
+    return engine
+
+
+def create_db_engine(database_url: str) -> Engine:
+    """
+    Create an engine with the shared pool settings and the SQLite profile.
+
+    Args:
+        database_url: SQLAlchemy database URL
+
+    Returns:
+        Configured engine
+    """
+    connect_args = {"check_same_thread": False} if database_url.startswith("sqlite") else {}
+    return configure_engine(create_engine(
+        database_url,
+        connect_args=connect_args,
+        poolclass=QueuePool,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_POOL_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT_SECONDS,
+        pool_pre_ping=True,
+        echo=False,
+    ))
@@ -0,0 +1,223 @@
+"""
+Data freshness targets, readiness checks and the staleness of served data.
+
+Stored data goes stale once its source is expected to have published since it
+was last scraped: rashifal after Nepal midnight, forex after the NRB publish
+time and so on. Those times are the crontab schedules of the resources in
+SCRAPE_SCHEDULES, which run just after each source publishes.
+"""
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+from sqlmodel import Session
+
+from cache.read_model import ReadModelSnapshot
+from cache.responses import latest_updated_at
+from config import NEPAL_TZ, SCRAPE_SCHEDULES
+from database.crud import (
+    calendar_crud, rashifal_crud, metal_price_crud,
+    forex_rate_crud, vegetable_price_crud, source_state_crud, panchang_day_crud
+)
+from scheduler import cron_trigger, previous_fire_time
+
+# Maximum age of the newest row in each table for the data to count as fresh
+FRESHNESS_TARGETS = {
+    "rashifal": (rashifal_crud, timedelta(hours=24)),
+    "metals": (metal_price_crud, timedelta(hours=24)),
+    "forex": (forex_rate_crud, timedelta(hours=24)),
+    "vegetables": (vegetable_price_crud, timedelta(hours=24)),
+    "calendar": (calendar_crud, timedelta(days=7)),
+}
+
+
+def _as_local(value: datetime) -> datetime:
+    """Drop any tzinfo added by the driver; updated_at is stored as local time."""
+    return value.replace(tzinfo=None) if value.tzinfo else value
+
+
+def check_freshness(db: Session) -> Dict[str, Dict[str, Any]]:
+    """Report the last update time and freshness of every tracked table.
+
+    A source counts as fresh when its table was written or its page was
+    fetched unchanged recently enough; unchanged pages don't touch the rows.
+    """
+    now = datetime.now()
+    report = {}
+    for name, (crud, max_age) in FRESHNESS_TARGETS.items():
+        updated_at = crud.get_last_updated(db)
+        updated_at = _as_local(updated_at) if updated_at else None
+        checked_at = source_state_crud.get_last_checked(db, prefix=name)
+        checked_at = _as_local(checked_at) if checked_at else None
+        latest = max(filter(None, (updated_at, checked_at)), default=None)
+        age = (now - latest).total_seconds() if latest else None
+        report[name] = {
+            "updated_at": updated_at.isoformat() if updated_at else None,
+            "checked_at": checked_at.isoformat() if checked_at else None,
+            "age_seconds": round(age) if age is not None else None,
+            "max_age_seconds": int(max_age.total_seconds()),
+            "fresh": age is not None and age <= max_age.total_seconds(),
+        }
+    return report
+
+
+def check_panchang(db: Session) -> Dict[str, Any]:
+    """Report whether today's panchang has been scraped and stored by the scraping leader.
+
+    The stored row is what every worker serves /today from, so unlike the
+    in-process cache it means the same thing in every worker.
+    """
+    today = datetime.now(NEPAL_TZ).date().isoformat()
+    stored = panchang_day_crud.get(db, today)
+    return {
+        "date": today,
+        "updated_at": stored.updated_at.isoformat() if stored else None,
+        "stored": stored is not None,
+    }
+
+
+class StalePolicy:
+    """Publish times of one source, after which stored data is stale."""
+
+    def __init__(self, expression: str):
+        self.trigger = cron_trigger(expression)
+        # (previous, next) publish times around the last lookup
+        self._window: Tuple[Optional[datetime], Optional[datetime]] = (None, None)
+
+    def boundaries(self, now: datetime) -> Tuple[Optional[datetime], Optional[datetime]]:
+        """
+        Get the publish times around `now`.
+
+        Args:
+            now: Timezone-aware current time
+
+        Returns:
+            (last publish time at or before `now`, next one after it)
+        """
+        previous, following = self._window
+        if following is None or now >= following or (previous is not None and now < previous):
+            previous = previous_fire_time(self.trigger, now)
+            following = self.trigger.get_next_fire_time(previous, previous or now)
+            self._window = (previous, following)
+        return previous, following
+
+
+# Staleness policy per resource
+STALE_POLICIES = {name: StalePolicy(expression) for name, expression in SCRAPE_SCHEDULES.items()}
+
+
+@dataclass(frozen=True)
+class DataFreshness:
+    """Freshness of the data behind a response.
+
+    Attributes:
+        updated_at: When the data last changed (server-local time)
+        verified_at: When the source was last fetched successfully, or
+            `updated_at` if that isn't known (server-local time)
+        age_seconds: Seconds since `verified_at`
+        stale: Whether the source has published since `verified_at`
+        fresh_for_seconds: Seconds until the source publishes next; 0 when
+            stale, None without a policy
+    """
+    updated_at: Optional[datetime]
+    verified_at: datetime
+    age_seconds: int
+    stale: bool
+    fresh_for_seconds: Optional[int]
+
+
+def data_freshness(
+    resource: str,
+    updated_at: Optional[datetime],
+    checked_at: Optional[datetime] = None,
+    now: Optional[datetime] = None
+) -> Optional[DataFreshness]:
+    """
+    Work out the freshness of stored data.
+
+    Args:
+        resource: Resource name in STALE_POLICIES, e.g. "forex"
+        updated_at: Latest `updated_at` of the rows
+        checked_at: Last successful fetch of their source, if known
+        now: Timezone-aware current time (defaults to now)
+
+    Returns:
+        Freshness, or None when neither time is known
+    """
+    updated_at = _as_local(updated_at) if updated_at else None
+    checked_at = _as_local(checked_at) if checked_at else None
+    verified_at = max(filter(None, (updated_at, checked_at)), default=None)
+    if verified_at is None:
+        return None
+
+    now = now or datetime.now(NEPAL_TZ)
+    # Stored times are naive server-local times
+    verified = verified_at.astimezone(NEPAL_TZ)
+    age = max(0, int((now - verified).total_seconds()))
+
+    stale, fresh_for = False, None
+    policy = STALE_POLICIES.get(resource)
+    if policy is not None:
+        previous, following = policy.boundaries(now)
+        stale = previous is not None and verified < previous
+        if stale:
+            fresh_for = 0
+        elif following is not None:
+            fresh_for = int((following - now).total_seconds())
+
+    return DataFreshness(
+        updated_at=updated_at,
+        verified_at=verified_at,
+        age_seconds=age,
+        stale=stale,
+        fresh_for_seconds=fresh_for,
+    )
+
+
+def snapshot_freshness(
+    snapshot: ReadModelSnapshot,
+    resource: str,
+    rows: Sequence,
+    source: Optional[str] = None
+) -> Optional[DataFreshness]:
+    """
+    Work out the freshness of rows taken from a read model snapshot.
+
+    Args:
+        snapshot: Read model snapshot the rows come from
+        resource: Resource name in STALE_POLICIES
+        rows: Rows being served
+        source: Scraped source of the rows (defaults to `resource`)
+
+    Returns:
+        Freshness, or None for no rows
+    """
+    if not rows:
+        return None
+    return data_freshness(resource, latest_updated_at(rows), snapshot.source_checked.get(source or resource))
+
+
+def freshness_headers(freshness: DataFreshness, max_age: int) -> Dict[str, str]:
+    """
+    Build the response headers exposing the freshness of the data.
+
+    `Age` counts from the last successful fetch of the source, so Cache-Control
+    max-age includes it: clients keep a copy for at most `max_age` seconds and
+    never past the next publish time, and stale data isn't kept at all.
+
+    Args:
+        freshness: Freshness of the data
+        max_age: Longest time in seconds clients may keep a fresh response
+
+    Returns:
+        Age, X-Data-Updated-At and Cache-Control headers
+    """
+    remaining = max_age
+    if freshness.fresh_for_seconds is not None:
+        remaining = min(max_age, freshness.fresh_for_seconds)
+    updated_at = freshness.updated_at or freshness.verified_at
+    return {
+        "Age": str(freshness.age_seconds),
+        "X-Data-Updated-At": updated_at.astimezone(NEPAL_TZ).isoformat(timespec="seconds"),
+        "Cache-Control": f"public, max-age={freshness.age_seconds + remaining}",
+    }
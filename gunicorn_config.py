@@ -1,13 +1,15 @@
 """
 Gunicorn configuration for production deployment on Render.
 """
+import multiprocessing
 import os
 
 # Bind to 0.0.0.0 to ensure the application is accessible
 bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
 
 # Worker configuration
-workers = 1
+# Only one worker scrapes (see leader.py), so workers can scale to the cores
+workers = int(os.environ.get("WEB_CONCURRENCY", multiprocessing.cpu_count()))
 worker_class = "uvicorn.workers.UvicornWorker"
 
 # Timeout configuration
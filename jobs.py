@@ -0,0 +1,116 @@
+"""
+Scrape jobs requested through /cron/scrape.
+
+A request only records a pending `ScrapeJob` row and returns its ID; the
+scraping leader runs pending jobs in the background and stores their outcome,
+which any worker can report from the database. A request made while a job is
+already pending or running gets that job back instead of a new one, and jobs
+that were still created concurrently are run together by a single cycle.
+"""
+import asyncio
+import logging
+import uuid
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Tuple
+
+from config import LEADER_POLL_SECONDS, SCRAPE_JOB_RETENTION_DAYS
+from database.crud import scrape_job_crud
+from database.executor import run_db
+from database.models import ScrapeJob
+from scraping.orchestrator import ScrapeFunction, run_scrape_cycle
+
+logger = logging.getLogger(__name__)
+
+
+def _submit(db, retention: timedelta) -> Tuple[ScrapeJob, bool]:
+    """Get the active job or create a pending one; returns (job, created)."""
+    active = scrape_job_crud.get_active(db)
+    if active is not None:
+        return active, False
+
+    scrape_job_crud.prune(db, before=datetime.now() - retention)
+    job = scrape_job_crud.create(db, obj_in={"id": uuid.uuid4().hex, "status": "pending"})
+    return job, True
+
+
+class ScrapeJobQueue:
+    """Submits scrape jobs and, in the leader process, runs them."""
+
+    def __init__(self, retention_days: float = SCRAPE_JOB_RETENTION_DAYS):
+        self.retention = timedelta(days=retention_days)
+        self._wakeup = asyncio.Event()
+
+    async def submit(self) -> Tuple[ScrapeJob, bool]:
+        """
+        Request a scrape cycle.
+
+        Returns:
+            The job that will cover the request and whether it was created for it
+        """
+        job, created = await run_db(_submit, self.retention)
+        if created:
+            logger.info(f"Scrape job {job.id} queued")
+            self._wakeup.set()
+        else:
+            logger.info(f"Scrape already {job.status} as job {job.id}, not queueing another")
+        return job, created
+
+    async def get(self, job_id: str) -> Optional[ScrapeJob]:
+        """Get a job by ID."""
+        return await run_db(scrape_job_crud.get, job_id)
+
+    async def run_pending(self, scrapers: Dict[str, ScrapeFunction]) -> None:
+        """Run one scrape cycle for all pending jobs, if there are any."""
+        jobs = await run_db(scrape_job_crud.claim_pending)
+        if not jobs:
+            return
+
+        ids = [job.id for job in jobs]
+        logger.info(f"Running scrape job(s) {', '.join(ids)}")
+        try:
+            summary = await run_scrape_cycle(scrapers)
+            outcome = {
+                "status": "completed",
+                "duration_seconds": summary["duration_seconds"],
+                "results": summary["results"],
+                "timings": summary["timings"],
+                "rows": summary["rows"],
+            }
+        except Exception as e:
+            logger.error(f"Error in scrape job(s) {', '.join(ids)}: {str(e)}")
+            outcome = {"status": "failed", "error": str(e)}
+
+        outcome["finished_at"] = datetime.now()
+        await run_db(scrape_job_crud.finish, ids=ids, obj_in=outcome)
+
+    async def serve(self, scrapers: Dict[str, ScrapeFunction], interval: float = LEADER_POLL_SECONDS) -> None:
+        """
+        Run pending jobs until cancelled; only the scraping leader calls this.
+
+        Jobs submitted by this process start right away, jobs submitted by
+        other workers are picked up within `interval` seconds.
+
+        Args:
+            scrapers: Mapping of source name to scrape function run for each job
+            interval: Seconds between checks for jobs from other workers
+        """
+        interrupted = await run_db(scrape_job_crud.fail_interrupted)
+        if interrupted:
+            logger.warning(f"Marked {interrupted} interrupted scrape job(s) as failed")
+
+        while True:
+            # Cleared first so a job submitted during the cycle isn't missed
+            self._wakeup.clear()
+            try:
+                await self.run_pending(scrapers)
+            except Exception as e:
+                logger.error(f"Error running scrape jobs: {str(e)}")
+
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=interval)
+            except asyncio.TimeoutError:
+                pass
+
+
+# Singleton instance
+scrape_jobs = ScrapeJobQueue()
@@ -0,0 +1,118 @@
+"""
+Leader election between worker processes.
+
+Workers share the SQLite file, so only one of them should scrape. The process
+holding an exclusive lock on the leader lock file owns scraping: the startup
+warm-up, the scheduler and cache-miss scrapes. The others only serve reads;
+they reload their read model when the database files change and keep trying
+the lock, so one of them takes over when the leader exits. The OS releases the
+lock when its holder dies.
+"""
+import asyncio
+import logging
+import os
+from typing import Awaitable, Callable, Optional, Tuple
+
+from cache.read_model import read_model
+from config import LEADER_LOCK_FILE, LEADER_POLL_SECONDS
+from database import DATABASE_PATH
+
+logger = logging.getLogger(__name__)
+
+# fcntl is POSIX only; without it every process runs as leader
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+
+def database_signature() -> Tuple:
+    """Get the size and mtime of the database and its WAL file, which change on commit."""
+    signature = []
+    for path in (str(DATABASE_PATH), f"{DATABASE_PATH}-wal"):
+        try:
+            stat = os.stat(path)
+            signature.append((stat.st_mtime_ns, stat.st_size))
+        except FileNotFoundError:
+            signature.append(None)
+    return tuple(signature)
+
+
+class LeaderElection:
+    """Exclusive, non-blocking file lock deciding which process owns scraping."""
+
+    def __init__(self, path: str = LEADER_LOCK_FILE or f"{DATABASE_PATH}.leader"):
+        self.path = path
+        self._file = None
+
+    @property
+    def is_leader(self) -> bool:
+        return self._file is not None or fcntl is None
+
+    def try_acquire(self) -> bool:
+        """
+        Try to become the leader without waiting.
+
+        Returns:
+            True if this process holds the lock
+        """
+        if self.is_leader:
+            return True
+
+        lock_file = open(self.path, "a+")
+        try:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return False
+
+        # Record the owner for whoever inspects the file
+        lock_file.seek(0)
+        lock_file.truncate()
+        lock_file.write(f"{os.getpid()}\n")
+        lock_file.flush()
+        self._file = lock_file
+        logger.info(f"Process {os.getpid()} is the scraping leader")
+        return True
+
+    def release(self) -> None:
+        """Give up leadership, if held."""
+        if self._file is None:
+            return
+        try:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+        finally:
+            self._file.close()
+            self._file = None
+
+    async def follow(
+        self,
+        on_elected: Callable[[], Awaitable[None]],
+        interval: float = LEADER_POLL_SECONDS
+    ) -> None:
+        """
+        Serve as a follower until the lock is won.
+
+        Reloads the read model whenever the database files change and calls
+        `on_elected` once this process becomes the leader.
+
+        Args:
+            on_elected: Coroutine function starting the leader's work
+            interval: Seconds between checks
+        """
+        signature: Optional[Tuple] = database_signature()
+        while True:
+            await asyncio.sleep(interval)
+
+            current = database_signature()
+            if current != signature:
+                signature = current
+                await read_model.refresh()
+
+            if self.try_acquire():
+                await on_elected()
+                return
+
+
+# Singleton instance
+leader = LeaderElection()
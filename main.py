@@ -1,31 +1,40 @@
-from fastapi import FastAPI, Depends, HTTPException, BackgroundTasks
+from fastapi import FastAPI, Body, HTTPException, BackgroundTasks, Request
 from fastapi.middleware.cors import CORSMiddleware
-from sqlmodel import Session, select, SQLModel, create_engine
+from fastapi.responses import JSONResponse
 import asyncio
 import logging
 import os
 import sys
-from typing import List, Optional
+from datetime import date
+from functools import partial
+from typing import Dict, List, Optional, Tuple
 
 # Import database and models
-from database import get_session, init_db
+from database import DATABASE_URL, init_db
 from database.models import (
     CalendarDay, Event, Rashifal, 
     MetalPrice, ForexRate, VegetablePrice
 )
 from database.migrations import ensure_schema_up_to_date
-from database.crud import (
-    calendar_crud, event_crud, rashifal_crud,
-    metal_price_crud, forex_rate_crud, vegetable_price_crud
+from database.executor import run_db
+from cache import panchang_cache, read_model, response_cache, scrape_flights
+from config import (
+    STARTUP_SCRAPE_MODE, RESPONSE_MAX_AGE_SECONDS, CALENDAR_RESPONSE_MAX_AGE_SECONDS, CONVERT_MAX_BATCH
 )
+from freshness import DataFreshness, check_freshness, check_panchang, freshness_headers, snapshot_freshness
+from leader import leader
+from jobs import scrape_jobs
+import nepali_date
 
 # Import scheduler and scraping functions
 from scheduler import scheduler
 from scraping import (
     scrape_rashifal, scrape_vegetables, scrape_metals,
-    scrape_forex, scrape_calendar, scrape_events, 
-    scrape_hamro_patro, scrape_panchang
+    scrape_forex, scrape_calendar, scrape_calendar_year, scrape_events
 )
+from scraping.fetcher import fetcher
+from scraping.orchestrator import run_scrape_cycle
+from scraping.workers import shutdown_parse_executor
 
 # Configure logging
 logging.basicConfig(
@@ -53,30 +62,38 @@ app.add_middleware(
 # Initialize database with schema migration
 def initialize_database():
     """Initialize the database with all models."""
-    database_url = "sqlite:///nepali_data.db"
-    logger.info(f"Initializing database at {database_url}")
-    engine = create_engine(database_url)
-    SQLModel.metadata.create_all(engine)
+    init_db()
     
     # Ensure database schema is up to date with all columns
-    ensure_schema_up_to_date(database_url)
+    ensure_schema_up_to_date(DATABASE_URL)
     
-    return database_url
+    return DATABASE_URL
 
 # Start app
 @app.on_event("startup")
 async def startup_event():
+    # Only one worker process owns scraping and schema changes
+    is_leader = leader.try_acquire()
+    
     # Initialize database
-    initialize_database()
-    logger.info("Database initialized")
+    if is_leader:
+        initialize_database()
+        logger.info("Database initialized")
     
-    # Start initial data scraping
-    logger.info("Starting initial data scraping")
-    await run_initial_scraping()
+    # Load the stored data the read endpoints serve
+    await read_model.refresh()
     
-    # Start scheduler
-    logger.info("Scheduler started")
-    asyncio.create_task(scheduler.start())
+    # Open the shared HTTP client used by all scrapers
+    await fetcher.start()
+    
+    if is_leader:
+        await start_scraping()
+    else:
+        # Serve reads and take over if the leader goes away
+        logger.info("Another worker owns scraping, serving reads only")
+        scrape_flights.enabled = False
+        panchang_cache.enabled = False
+        app.state.follower_task = asyncio.create_task(leader.follow(take_over_scraping))
 
     # For Render deployment - bind to 0.0.0.0 explicitly
     import socket
@@ -91,34 +108,134 @@ async def startup_event():
     finally:
         sock.close()
 
+async def start_scraping():
+    """Start the scraping leader's work: the warm-up scrape and the scheduler."""
+    scrape_flights.enabled = True
+    panchang_cache.enabled = True
+    
+    # Start initial data scraping
+    if STARTUP_SCRAPE_MODE == "blocking":
+        logger.info("Starting initial data scraping")
+        await run_initial_scraping()
+    else:
+        # Serve existing data right away and warm up in the background
+        logger.info("Starting initial data scraping in the background")
+        app.state.warmup_task = asyncio.create_task(run_initial_scraping())
+    
+    # Start scheduler
+    logger.info("Scheduler started")
+    asyncio.create_task(scheduler.start())
+    
+    # Run jobs queued through /cron/scrape
+    app.state.scrape_job_task = asyncio.create_task(scrape_jobs.serve(CRON_SCRAPERS))
+
+async def take_over_scraping():
+    """Become the scraping leader after the previous one exited."""
+    logger.info("Taking over scraping from the previous leader")
+    initialize_database()
+    await read_model.refresh()
+    await start_scraping()
+
 @app.on_event("shutdown")
 async def shutdown_event():
+    # Stop following the leader
+    follower_task = getattr(app.state, "follower_task", None)
+    if follower_task and not follower_task.done():
+        follower_task.cancel()
+    
+    # Stop running queued scrape jobs
+    scrape_job_task = getattr(app.state, "scrape_job_task", None)
+    if scrape_job_task and not scrape_job_task.done():
+        scrape_job_task.cancel()
+    
+    # Cancel the warm-up scrape if it is still running
+    warmup_task = getattr(app.state, "warmup_task", None)
+    if warmup_task and not warmup_task.done():
+        warmup_task.cancel()
+    
     # Stop scheduler
     await scheduler.stop()
     logger.info("Scheduler stopped")
+    
+    # Close pooled upstream connections
+    await fetcher.close()
+    
+    # Stop the HTML parse workers
+    shutdown_parse_executor()
+    
+    # Let another worker take over scraping
+    leader.release()
+
+# Progress of the startup warm-up scrape, reported by /ready
+warmup_state = {"status": "pending", "started_at": None, "finished_at": None}
 
 # Initial scraping function
 async def run_initial_scraping():
     """Run initial scraping tasks on startup."""
+    from datetime import datetime
+    warmup_state.update(status="running", started_at=datetime.now().isoformat())
     try:
-        db = Session(next(get_session()))
-        
-        # Run all scraping tasks
-        await scrape_rashifal(db)
-        await scrape_vegetables(db)
-        await scrape_metals(db)
-        await scrape_forex(db)
-        await scrape_panchang(db)  # Add panchang scraping
-        
         # For calendar and events, scrape current data
-        from datetime import datetime
         now = datetime.now()
-        await scrape_calendar(db, year=now.year, month=now.month)
-        await scrape_events(db, year=now.year)
         
-        logger.info("Initial data scraping completed")
+        # Run all scraping tasks concurrently
+        summary = await run_scrape_cycle({
+            "scrape_rashifal": scrape_rashifal,
+            "scrape_vegetables": scrape_vegetables,
+            "scrape_metals": scrape_metals,
+            "scrape_forex": scrape_forex,
+            "scrape_panchang": panchang_cache.refresh,  # Warm the /today cache
+            "scrape_calendar": scrape_calendar,  # Current BS month
+            "scrape_events": partial(scrape_events, year=now.year),
+        })
+        
+        logger.info(f"Initial data scraping completed in {summary['duration_seconds']} seconds")
+        warmup_state["status"] = "completed"
     except Exception as e:
         logger.error(f"Error in initial data scraping: {str(e)}")
+        warmup_state["status"] = "failed"
+    finally:
+        warmup_state["finished_at"] = datetime.now().isoformat()
+
+
+def refreshing(scraper):
+    """Wrap a route's scraper so its rows, or its check of an unchanged page, reach the read model."""
+    async def scrape_and_refresh():
+        results = await scraper()
+        await read_model.refresh()
+        return results
+    return scrape_and_refresh
+
+
+def revalidating(freshness: Optional[DataFreshness], key: Tuple, scraper, max_age: int) -> Dict[str, str]:
+    """
+    Refresh stale data in the background and get the headers to serve it with.
+
+    Stale data is still served right away; the refresh runs once for all
+    concurrent requests, and only in the scraping leader.
+
+    Args:
+        freshness: Freshness of the data being served, None if unknown
+        key: Scrape flight key of the data
+        scraper: Coroutine function refreshing the data
+        max_age: Cache-Control max-age of fresh responses in seconds
+
+    Returns:
+        Freshness headers for the response
+    """
+    if freshness is None:
+        return {}
+    if freshness.stale:
+        scrape_flights.start(key, scraper)
+    return freshness_headers(freshness, max_age)
+
+
+def calendar_year_not_found(year: int) -> HTTPException:
+    """Build the 404 for a BS year outside the local calendar table, which is never scraped."""
+    return HTTPException(
+        status_code=404,
+        detail=f"BS year {year} is outside the supported range {nepali_date.BS_MIN_YEAR}-{nepali_date.BS_MAX_YEAR}"
+    )
 
 
 # API Routes
@@ -132,29 +249,109 @@ async def read_root():
         "version": "1.0.0",
     }
 
+@app.get("/ready", tags=["Root"])
+async def readiness():
+    """Readiness probe: 200 once every data source meets its freshness target.
+
+    Readiness only depends on the shared database, so followers report the
+    same as the leader; the warm-up and the schedule are only reported by the
+    leader, which runs them.
+    """
+    sources = await run_db(check_freshness)
+    today = await run_db(check_panchang)
+    ready = all(source["fresh"] for source in sources.values()) and today["stored"]
+    content = {
+        "ready": ready,
+        "scraping_leader": leader.is_leader,
+        "today": today,
+        "today_cached": panchang_cache.is_fresh(),
+        "upstream_circuits": fetcher.circuit_states(),
+        "sources": sources,
+    }
+    if leader.is_leader:
+        content["warmup"] = warmup_state
+        content["next_scheduled_runs"] = scheduler.next_runs()
+    return JSONResponse(status_code=200 if ready else 503, content=content)
+
+@app.get("/calendar/{year}", tags=["Calendar"], response_model=List[CalendarDay])
+async def get_calendar_year(request: Request, year: int):
+    """Get calendar days for every month of a BS year, ordered by month and day."""
+    # Checked before any scrape: the year comes from the URL and every month is a request upstream
+    if not nepali_date.BS_MIN_YEAR <= year <= nepali_date.BS_MAX_YEAR:
+        raise calendar_year_not_found(year)
+    
+    snapshot = read_model.snapshot
+    months = {month: snapshot.calendar.get((year, month), ()) for month in range(1, 13)}
+    max_age = CALENDAR_RESPONSE_MAX_AGE_SECONDS
+    headers = {}
+    
+    # Scrape the year's months concurrently (once for all concurrent requests)
+    key = ("calendar", year)
+    missing = [month for month, days in months.items() if not days]
+    if not missing:
+        # Serve a stale year right away and refresh it in the background; the
+        # least recently checked month decides whether the year is stale
+        freshness = [
+            snapshot_freshness(snapshot, "calendar", days, f"calendar:{year}-{month:02d}")
+            for month, days in months.items()
+        ]
+        oldest = max(filter(None, freshness), key=lambda month: month.age_seconds, default=None)
+        headers = revalidating(oldest, key, refreshing(partial(scrape_calendar_year, year=year)), max_age)
+    else:
+        # Fill the gaps from the locally built months while only those are scraped
+        for month in missing:
+            months[month] = [CalendarDay(**day) for day in nepali_date.month_calendar(year, month)]
+        scrape_flights.start(key, refreshing(partial(scrape_calendar_year, year=year, months=missing)))
+        # Don't let clients keep the unannotated days for long
+        max_age = RESPONSE_MAX_AGE_SECONDS
+    
+    calendar_days = [day for month in range(1, 13) for day in months[month]]
+    return response_cache.respond(
+        request, ("calendar", year), snapshot.version, calendar_days, max_age=max_age,
+        extra_headers=headers
+    )
+
 @app.get("/calendar/{year}/{month}", tags=["Calendar"], response_model=List[CalendarDay])
 async def get_calendar(
+    request: Request,
     year: int, 
-    month: int, 
-    db: Session = Depends(get_session)
+    month: int
 ):
-    """Get calendar days for a specific month."""
-    calendar_days = calendar_crud.get_by_date(db=db, year=year, month=month)
+    """Get calendar days for a specific month (BS year and month)."""
+    if not 1 <= month <= 12:
+        raise HTTPException(status_code=400, detail=f"Invalid month: {month}. Months are numbered 1 to 12")
     
-    if not calendar_days:
-        # If no data found, try to scrape it
-        await scrape_calendar(db, year=year, month=month)
-        calendar_days = calendar_crud.get_by_date(db=db, year=year, month=month)
+    snapshot = read_model.snapshot
+    calendar_days = snapshot.calendar.get((year, month), ())
+    max_age = CALENDAR_RESPONSE_MAX_AGE_SECONDS
+    headers = {}
+    
+    key = ("calendar", year, month)
+    scrape_month = refreshing(partial(scrape_calendar, year=year, month=month))
+    if calendar_days:
+        # Serve a stale month right away and refresh it in the background
+        freshness = snapshot_freshness(snapshot, "calendar", calendar_days, f"calendar:{year}-{month:02d}")
+        headers = revalidating(freshness, key, scrape_month, max_age)
+    else:
+        # If no data found, scrape it (once for all concurrent requests)
+        try:
+            # Answer from the locally built month while the tithis and events are fetched
+            calendar_days = [CalendarDay(**day) for day in nepali_date.month_calendar(year, month)]
+            scrape_flights.start(key, scrape_month)
+            # Don't let clients keep the unannotated days for long
+            max_age = RESPONSE_MAX_AGE_SECONDS
+        except ValueError:
+            raise calendar_year_not_found(year)
         
-    return calendar_days
+    return response_cache.respond(
+        request, ("calendar", year, month), snapshot.version, list(calendar_days), max_age=max_age,
+        extra_headers=headers
+    )
 
 @app.get("/today", tags=["Calendar"])
-async def get_today_date(
-    db: Session = Depends(get_session)
-):
-    from database.session import get_session, create_db_and_tables
-    # Use the existing get_session from our session module
-    today_info = await scrape_panchang(db)
+async def get_today_date():
+    """Get today's Nepali date and panchang, served from an in-memory cache."""
+    today_info = await panchang_cache.get()
     
     if not today_info:
         # If scraping fails, return a simple error response
@@ -164,29 +361,38 @@ async def get_today_date(
 
 @app.get("/events/{year}", tags=["Events"], response_model=List[Event])
 async def get_events(
+    request: Request,
     year: int, 
-    month: Optional[int] = None,
-    db: Session = Depends(get_session)
+    month: Optional[int] = None
 ):
     """Get events for a specific year and optional month."""
-    if month:
-        events = event_crud.get_by_date(db=db, year=year, month=month)
-    else:
-        events = event_crud.get_by_year(db=db, year=year)
+    def select_events(snapshot) -> List[Event]:
+        events = snapshot.events.get(year, ())
+        if month:
+            return [event for event in events if event.month == month]
+        return list(events)
+    
+    snapshot = read_model.snapshot
+    events = select_events(snapshot)
+    key = ("events", year)
+    scraper = refreshing(partial(scrape_events, year=year))
     
     if not events:
-        # If no data found, try to scrape it
-        await scrape_events(db, year=year)
-        
-        if month:
-            events = event_crud.get_by_date(db=db, year=year, month=month)
-        else:
-            events = event_crud.get_by_year(db=db, year=year)
-        
-    return events
+        # If no data found, try to scrape it (once for all concurrent requests)
+        await scrape_flights.do(key, scraper)
+        snapshot = read_model.snapshot
+        events = select_events(snapshot)
+    
+    # Serve stale events right away and refresh them in the background
+    max_age = CALENDAR_RESPONSE_MAX_AGE_SECONDS
+    freshness = snapshot_freshness(snapshot, "events", events, f"events:{year}")
+    return response_cache.respond(
+        request, ("events", year, month), snapshot.version, events, max_age=max_age,
+        extra_headers=revalidating(freshness, key, scraper, max_age)
+    )
 
 @app.get("/rashifal/{sign}", tags=["Rashifal"])
-async def get_rashifal(sign: str):
+async def get_rashifal(request: Request, sign: str):
     """Get latest rashifal for a specific zodiac sign."""
     import logging
     logger = logging.getLogger(__name__)
@@ -201,35 +407,40 @@ async def get_rashifal(sign: str):
                 detail=f"Invalid zodiac sign: {sign}. Valid signs are: {valid_signs}"
             )
         
-        # Get from database using context manager
-        from database import get_db_context
-        with get_db_context() as db:
-            # Try to get from database first
-            rashifal = rashifal_crud.get_by_sign(db=db, sign=sign)
+        # Try to get from database first
+        snapshot = read_model.snapshot
+        rashifal = snapshot.rashifal.get(sign)
+        
+        if not rashifal:
+            logger.info(f"Rashifal not found in database for sign '{sign}', attempting to scrape fresh data")
+            # Try to scrape fresh data; an unchanged page is no failure, it
+            # may still hold the sign
+            scraped_data = await scrape_flights.do(("rashifal",), refreshing(scrape_rashifal))
             
-            if not rashifal:
-                logger.info(f"Rashifal not found in database for sign '{sign}', attempting to scrape fresh data")
-                # Try to scrape fresh data
-                scraped_data = await scrape_rashifal(db)
-                
-                if not scraped_data:
-                    logger.error(f"Failed to scrape rashifal data for sign '{sign}'")
-                    raise HTTPException(
-                        status_code=503, 
-                        detail=f"Unable to fetch rashifal data from source. Please try again later."
-                    )
-                
-                # Try to get the data again after scraping
-                rashifal = rashifal_crud.get_by_sign(db=db, sign=sign)
-                
-                if not rashifal:
-                    logger.error(f"Rashifal still not found after scraping for sign '{sign}'")
-                    raise HTTPException(
-                        status_code=404, 
-                        detail=f"Rashifal for sign '{sign}' not found even after scraping fresh data"
-                    )
+            # Try to get the data again after scraping
+            snapshot = read_model.snapshot
+            rashifal = snapshot.rashifal.get(sign)
             
-            return rashifal
+            if not rashifal and scraped_data is None:
+                logger.error(f"Failed to scrape rashifal data for sign '{sign}'")
+                raise HTTPException(
+                    status_code=503, 
+                    detail=f"Unable to fetch rashifal data from source. Please try again later."
+                )
+            
+            if not rashifal:
+                logger.error(f"Rashifal still not found after scraping for sign '{sign}'")
+                raise HTTPException(
+                    status_code=404, 
+                    detail=f"Rashifal for sign '{sign}' not found even after scraping fresh data"
+                )
+        
+        # Serve a stale rashifal right away and refresh it in the background
+        freshness = snapshot_freshness(snapshot, "rashifal", [rashifal])
+        headers = revalidating(freshness, ("rashifal",), refreshing(scrape_rashifal), RESPONSE_MAX_AGE_SECONDS)
+        return response_cache.respond(
+            request, ("rashifal", sign), snapshot.version, rashifal, extra_headers=headers
+        )
             
     except HTTPException:
         raise
@@ -240,101 +451,156 @@ async def get_rashifal(sign: str):
             detail=f"An unexpected error occurred while fetching rashifal data: {str(e)}"
         )
 
-@app.get("/prices/vegetables", tags=["Prices"], response_model=List[VegetablePrice])
-async def get_vegetable_prices(
-    db: Session = Depends(get_session)
-):
-    """Get latest vegetable prices."""
-    prices = vegetable_price_crud.get_latest(db=db)
+async def serve_prices(request: Request, name: str, scraper):
+    """
+    Serve the latest prices of one price resource.
+
+    Prices are scraped inline when there are none, and stale ones are served
+    right away while they are refreshed in the background.
+
+    Args:
+        request: Incoming request
+        name: Price resource ("vegetables", "metals" or "forex")
+        scraper: Scrape function of the resource
+    """
+    snapshot = read_model.snapshot
+    prices = snapshot.prices.get(name, ())
+    key = (name,)
     
     if not prices:
-        # If no data found, try to scrape it
-        await scrape_vegetables(db)
-        prices = vegetable_price_crud.get_latest(db=db)
-        
-    return prices
+        # If no data found, try to scrape it (once for all concurrent requests)
+        await scrape_flights.do(key, refreshing(scraper))
+        snapshot = read_model.snapshot
+        prices = snapshot.prices.get(name, ())
+    
+    freshness = snapshot_freshness(snapshot, name, prices)
+    headers = revalidating(freshness, key, refreshing(scraper), RESPONSE_MAX_AGE_SECONDS)
+    return response_cache.respond(request, ("prices", name), snapshot.version, list(prices), extra_headers=headers)
+
+@app.get("/prices/vegetables", tags=["Prices"], response_model=List[VegetablePrice])
+async def get_vegetable_prices(request: Request):
+    """Get latest vegetable prices."""
+    return await serve_prices(request, "vegetables", scrape_vegetables)
 
 @app.get("/prices/metals", tags=["Prices"], response_model=List[MetalPrice])
-async def get_metal_prices(
-    db: Session = Depends(get_session)
-):
+async def get_metal_prices(request: Request):
     """Get latest metal prices (gold/silver)."""
-    prices = metal_price_crud.get_latest(db=db)
-    
-    if not prices:
-        # If no data found, try to scrape it
-        await scrape_metals(db)
-        prices = metal_price_crud.get_latest(db=db)
-        
-    return prices
+    return await serve_prices(request, "metals", scrape_metals)
 
 @app.get("/prices/forex", tags=["Prices"], response_model=List[ForexRate])
-async def get_forex_rates(
-    db: Session = Depends(get_session)
-):
+async def get_forex_rates(request: Request):
     """Get latest forex rates."""
-    rates = forex_rate_crud.get_latest(db=db)
-    
-    if not rates:
-        # If no data found, try to scrape it
-        await scrape_forex(db)
-        rates = forex_rate_crud.get_latest(db=db)
-        
-    return rates
+    return await serve_prices(request, "forex", scrape_forex)
 
 
-@app.get("/cron/scrape", tags=["Admin"])
+def convert_ad_date(value: str) -> Dict:
+    """Convert a YYYY-MM-DD AD date to BS, raising a 400 error when it is invalid."""
+    try:
+        ad = date.fromisoformat(value.strip())
+        return nepali_date.describe(nepali_date.ad_to_bs(ad), ad)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid AD date '{value}': {str(e)}")
+
+def convert_bs_date(value: str) -> Dict:
+    """Convert a YYYY-MM-DD BS date to AD, raising a 400 error when it is invalid."""
+    try:
+        bs = nepali_date.parse_bs(value)
+        return nepali_date.describe(bs, nepali_date.bs_to_ad(*bs))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid BS date '{value}': {str(e)}")
+
+def check_batch_size(dates: List[str]) -> None:
+    """Reject batch conversions over the configured size."""
+    if len(dates) > CONVERT_MAX_BATCH:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {CONVERT_MAX_BATCH} dates can be converted per request"
+        )
+
+@app.get("/convert/ad-to-bs", tags=["Convert"])
+async def ad_to_bs(date: str):
+    """Convert an AD date (YYYY-MM-DD) to Bikram Sambat."""
+    return convert_ad_date(date)
+
+@app.post("/convert/ad-to-bs", tags=["Convert"])
+async def ad_to_bs_batch(dates: List[str] = Body(...)):
+    """Convert a list of AD dates (YYYY-MM-DD) to Bikram Sambat."""
+    check_batch_size(dates)
+    return [convert_ad_date(value) for value in dates]
+
+@app.get("/convert/bs-to-ad", tags=["Convert"])
+async def bs_to_ad(date: str):
+    """Convert a Bikram Sambat date (YYYY-MM-DD, Arabic or Devanagari digits) to AD."""
+    return convert_bs_date(date)
+
+@app.post("/convert/bs-to-ad", tags=["Convert"])
+async def bs_to_ad_batch(dates: List[str] = Body(...)):
+    """Convert a list of Bikram Sambat dates (YYYY-MM-DD) to AD."""
+    check_batch_size(dates)
+    return [convert_bs_date(value) for value in dates]
+
+
+# Sources scraped by each /cron/scrape job: the daily changing data
+CRON_SCRAPERS = {
+    scraper.__name__: scraper
+    for scraper in [scrape_rashifal, scrape_metals, scrape_vegetables, scrape_forex, scrape_events]
+}
+
+
+def job_status(job) -> Dict:
+    """Build the public view of a scrape job."""
+    return {
+        "job_id": job.id,
+        "status": job.status,
+        "status_url": f"/cron/jobs/{job.id}",
+        "requested_at": job.requested_at.isoformat(),
+        "started_at": job.started_at.isoformat() if job.started_at else None,
+        "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+        "duration_seconds": job.duration_seconds,
+        "results": job.results,
+        "timings": job.timings,
+        "rows": job.rows,
+        "error": job.error,
+    }
+
+
+@app.get("/cron/scrape", tags=["Admin"], status_code=202)
 async def trigger_scrape(api_key: str = None):
     """Endpoint for external cron job to trigger data scraping.
     
     This endpoint is designed to be called by cron-job.org to trigger scraping every 8 hours.
-    It will scrape all daily changing data like rashifal, metals, vegetables, etc.
+    It queues a job that scrapes all daily changing data like rashifal, metals, vegetables, etc.
+    and returns 202 right away; poll the returned status_url for its progress. While a job
+    is pending or running, calls return that job instead of queueing another one.
     
     Args:
         api_key: Optional API key for security (can be configured in production)
     """
-    from datetime import datetime
-    import logging
-    logger = logging.getLogger(__name__)
-    
     # In production, you should add proper API key validation
     # if api_key != "your_secret_api_key":
     #     raise HTTPException(status_code=403, detail="Invalid API key")
     
     try:
-        # Get database session using context manager
-        from database import get_db_context
-        with get_db_context() as db:
-        
-            # Run scraping tasks for daily changing data
-            start_time = datetime.now()
-            logger.info(f"Starting scheduled scraping at {start_time}")
-            
-            results = {}
-            for scraper in [scrape_rashifal, scrape_metals, scrape_vegetables, scrape_forex, scrape_events]:
-                try:
-                    await scraper(db)
-                    results[scraper.__name__] = "success"
-                except Exception as e:
-                    error_msg = f"Error in {scraper.__name__}: {str(e)}"
-                    logger.error(error_msg)
-                    results[scraper.__name__] = f"error: {str(e)}"
-            
-            end_time = datetime.now()
-            duration = (end_time - start_time).total_seconds()
-            logger.info(f"Completed scheduled scraping in {duration} seconds")
-            
-            return {
-                "status": "completed",
-                "start_time": start_time.isoformat(),
-                "end_time": end_time.isoformat(),
-                "duration_seconds": duration,
-                "results": results
-            }
+        job, created = await scrape_jobs.submit()
     except Exception as e:
-        error_msg = f"Critical error in scheduled scraping: {str(e)}"
+        error_msg = f"Could not queue scrape job: {str(e)}"
         logger.error(error_msg)
         raise HTTPException(status_code=500, detail=error_msg)
+    
+    return JSONResponse(
+        status_code=202,
+        content={**job_status(job), "merged": not created},
+        headers={"Location": f"/cron/jobs/{job.id}"},
+    )
+
+
+@app.get("/cron/jobs/{job_id}", tags=["Admin"])
+async def get_scrape_job(job_id: str):
+    """Get the status, per-source results, timings and row counts of a scrape job."""
+    job = await scrape_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Scrape job {job_id} not found")
+    return job_status(job)
 
 
 if __name__ == "__main__":
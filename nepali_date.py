@@ -0,0 +1,369 @@
+"""
+Bikram Sambat (BS) <-> Gregorian (AD) date conversion.
+
+BS month lengths don't follow a rule; they come from the published calendars,
+so conversion is arithmetic over a table of known month lengths. The table is
+flattened into an array with the cumulative day count at the start of every
+month, which makes BS -> AD a single lookup and AD -> BS a binary search over
+about 1,500 offsets. No network access is needed.
+"""
+from array import array
+from bisect import bisect_right
+from datetime import date, datetime, timedelta
+from itertools import accumulate
+from typing import Dict, List, NamedTuple, Optional, Union
+
+from config import NEPAL_TZ
+
+# Nepali month names with English equivalents
+NEPALI_MONTHS = {
+    1: "वैशाख",
+    2: "जेठ",
+    3: "असार",
+    4: "साउन",
+    5: "भदौ",
+    6: "असोज",
+    7: "कार्तिक",
+    8: "मंसिर",
+    9: "पुष",
+    10: "माघ",
+    11: "फागुन",
+    12: "चैत"
+}
+
+# Map English month names to month numbers
+MONTH_NAMES_TO_NUMBERS = {
+    "Baishakh": 1, "Jestha": 2, "Ashadh": 3, "Shrawan": 4,
+    "Bhadra": 5, "Ashwin": 6, "Kartik": 7, "Mangsir": 8,
+    "Poush": 9, "Magh": 10, "Falgun": 11, "Chaitra": 12
+}
+
+# Map from month number to English month name
+NUMBERS_TO_MONTH_NAMES = {number: name for name, number in MONTH_NAMES_TO_NUMBERS.items()}
+
+# Devanagari digits to Arabic numerals
+DEVANAGARI_TO_ARABIC = {
+    '०': '0', '१': '1', '२': '2', '३': '3', '४': '4',
+    '५': '5', '६': '6', '७': '7', '८': '8', '९': '9'
+}
+
+ARABIC_TO_DEVANAGARI = {arabic: devanagari for devanagari, arabic in DEVANAGARI_TO_ARABIC.items()}
+
+# Nepali weekday names with English equivalents
+NEPALI_WEEKDAYS = {
+    "आइतवार": "Sunday",
+    "सोमवार": "Monday",
+    "मङ्गलवार": "Tuesday",
+    "बुधवार": "Wednesday",
+    "बिहिवार": "Thursday",
+    "शुक्रवार": "Friday",
+    "शनिवार": "Saturday"
+}
+
+ENGLISH_TO_NEPALI_WEEKDAYS = {english: nepali for nepali, english in NEPALI_WEEKDAYS.items()}
+
+# English weekday names indexed by date.weekday(), and AD month names and the
+# abbreviations used in the calendar's english_date, independent of the locale
+WEEKDAY_NAMES = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+AD_MONTH_NAMES = (
+    "January", "February", "March", "April", "May", "June",
+    "July", "August", "September", "October", "November", "December"
+)
+AD_MONTH_ABBREVIATIONS = ("JAN", "FEB", "MAR", "APR", "MAY", "JUN", "JUL", "AUG", "SEP", "OCT", "NOV", "DEC")
+
+# First BS year in the table and the AD date of its 1 Baishakh
+BS_MIN_YEAR = 1975
+BS_EPOCH_AD = date(1918, 4, 13)
+
+# Days in each month (Baishakh..Chaitra) per BS year, from the published calendars
+_BS_MONTH_DAYS = (
+    (31, 31, 32, 32, 31, 30, 30, 29, 30, 29, 30, 30),  # 1975
+    (31, 32, 31, 32, 31, 30, 30, 30, 29, 29, 30, 31),  # 1976
+    (30, 32, 31, 32, 31, 30, 30, 30, 29, 30, 29, 31),  # 1977
+    (31, 31, 32, 31, 31, 31, 30, 29, 30, 29, 30, 30),  # 1978
+    (31, 31, 32, 32, 31, 30, 30, 29, 30, 29, 30, 30),  # 1979
+    (31, 32, 31, 32, 31, 30, 30, 30, 29, 29, 30, 31),  # 1980
+    (31, 31, 31, 32, 31, 31, 29, 30, 30, 29, 30, 30),  # 1981
+    (31, 31, 32, 31, 31, 31, 30, 29, 30, 29, 30, 30),  # 1982
+    (31, 31, 32, 32, 31, 30, 30, 29, 30, 29, 30, 30),  # 1983
+    (31, 32, 31, 32, 31, 30, 30, 30, 29, 29, 30, 31),  # 1984
+    (31, 31, 31, 32, 31, 31, 29, 30, 30, 29, 30, 30),  # 1985
+    (31, 31, 32, 31, 31, 31, 30, 29, 30, 29, 30, 30),  # 1986
+    (31, 32, 31, 32, 31, 30, 30, 29, 30, 29, 30, 30),  # 1987
+    (31, 32, 31, 32, 31, 30, 30, 30, 29, 29, 30, 31),  # 1988
+    (31, 31, 31, 32, 31, 31, 29, 30, 30, 29, 30, 30),  # 1989
+    (31, 31, 32, 31, 31, 31, 30, 29, 30, 29, 30, 30),  # 1990
+    (31, 32, 31, 32, 31, 30, 30, 30, 29, 29, 30, 30),  # 1991
+    (31, 32, 31, 32, 31, 30, 30, 30, 29, 30, 29, 31),  # 1992
+    (31, 31, 32, 31, 31, 31, 30, 29, 30, 29, 30, 30),  # 1993
+    (31, 31, 32, 31, 31, 31, 30, 29, 30, 29, 30, 30),  # 1994
+    (31, 32, 31, 32, 31, 30, 30, 30, 29, 29, 30, 30),  # 1995
+    (31, 32, 31, 32, 31, 30, 30, 30, 29, 30, 29, 31),  # 1996
+    (31, 31, 32, 31, 31, 31, 30, 29, 30, 29, 30, 30),  # 1997
+    (31, 31, 32, 31, 31, 31, 30, 29, 30, 29, 30, 30),  # 1998
+    (31, 32, 31, 32, 31, 30, 30, 30, 29, 29, 30, 31),  # 1999
+    (30, 32, 31, 32, 31, 30, 30, 30, 29, 30, 29, 31),  # 2000
+    (31, 31, 32, 31, 31, 31, 30, 29, 30, 29, 30, 30),  # 2001
+    (31, 31, 32, 32, 31, 30, 30, 29, 30, 29, 30, 30),  # 2002
+    (31, 32, 31, 32, 31, 30, 30, 30, 29, 29, 30, 31),  # 2003
+    (30, 32, 31, 32, 31, 30, 30, 30, 29, 30, 29, 31),  # 2004
+    (31, 31, 32, 31, 31, 31, 30, 29, 30, 29, 30, 30),  # 2005
+    (31, 31, 32, 32, 31, 30, 30, 29, 30, 29, 30, 30),  # 2006
+    (31, 32, 31, 32, 31, 30, 30, 30, 29, 29, 30, 31),  # 2007
+    (31, 31, 31, 32, 31, 31, 29, 30, 30, 29, 29, 31),  # 2008
+    (31, 31, 32, 31, 31, 31, 30, 29, 30, 29, 30, 30),  # 2009
+    (31, 31, 32, 32, 31, 30, 30, 29, 30, 29, 30, 30),  # 2010
+    (31, 32, 31, 32, 31, 30, 30, 30, 29, 29, 30, 31),  # 2011
+    (31, 31, 31, 32, 31, 31, 29, 30, 30, 29, 30, 30),  # 2012
+    (31, 31, 32, 31, 31, 31, 30, 29, 30, 29, 30, 30),  # 2013
+    (31, 31, 32, 32, 31, 30, 30, 29, 30, 29, 30, 30),  # 2014
+    (31, 32, 31, 32, 31, 30, 30, 30, 29, 29, 30, 31),  # 2015
+    (31, 31, 31, 32, 31, 31, 29, 30, 30, 29, 30, 30),  # 2016
+    (31, 31, 32, 31, 31, 31, 30, 29, 30, 29, 30, 30),  # 2017
+    (31, 32, 31, 32, 31, 30, 30, 29, 30, 29, 30, 30),  # 2018
+    (31, 32, 31, 32, 31, 30, 30, 30, 29, 30, 29, 31),  # 2019
+    (31, 31, 31, 32, 31, 31, 30, 29, 30, 29, 30, 30),  # 2020
+    (31, 31, 32, 31, 31, 31, 30, 29, 30, 29, 30, 30),  # 2021
+    (31, 32, 31, 32, 31, 30, 30, 30, 29, 29, 30, 30),  # 2022
+    (31, 32, 31, 32, 31, 30, 30, 30, 29, 30, 29, 31),  # 2023
+    (31, 31, 31, 32, 31, 31, 30, 29, 30, 29, 30, 30),  # 2024
+    (31, 31, 32, 31, 31, 31, 30, 29, 30, 29, 30, 30),  # 2025
+    (31, 32, 31, 32, 31, 30, 30, 30, 29, 29, 30, 31),  # 2026
+    (30, 32, 31, 32, 31, 30, 30, 30, 29, 30, 29, 31),  # 2027
+    (31, 31, 32, 31, 31, 31, 30, 29, 30, 29, 30, 30),  # 2028
+    (31, 31, 32, 31, 32, 30, 30, 29, 30, 29, 30, 30),  # 2029
+    (31, 32, 31, 32, 31, 30, 30, 30, 29, 29, 30, 31),  # 2030
+    (30, 32, 31, 32, 31, 30, 30, 30, 29, 30, 29, 31),  # 2031
+    (31, 31, 32, 31, 31, 31, 30, 29, 30, 29, 30, 30),  # 2032
+    (31, 31, 32, 32, 31, 30, 30, 29, 30, 29, 30, 30),  # 2033
+    (31, 32, 31, 32, 31, 30, 30, 30, 29, 29, 30, 31),  # 2034
+    (30, 32, 31, 32, 31, 31, 29, 30, 30, 29, 29, 31),  # 2035
+    (31, 31, 32, 31, 31, 31, 30, 29, 30, 29, 30, 30),  # 2036
+    (31, 31, 32, 32, 31, 30, 30, 29, 30, 29, 30, 30),  # 2037
+    (31, 32, 31, 32, 31, 30, 30, 30, 29, 29, 30, 31),  # 2038
+    (31, 31, 31, 32, 31, 31, 29, 30, 30, 29, 30, 30),  # 2039
+    (31, 31, 32, 31, 31, 31, 30, 29, 30, 29, 30, 30),  # 2040
+    (31, 31, 32, 32, 31, 30, 30, 29, 30, 29, 30, 30),  # 2041
+    (31, 32, 31, 32, 31, 30, 30, 30, 29, 29, 30, 31),  # 2042
+    (31, 31, 31, 32, 31, 31, 29, 30, 30, 29, 30, 30),  # 2043
+    (31, 31, 32, 31, 31, 31, 30, 29, 30, 29, 30, 30),  # 2044
+    (31, 32, 31, 32, 31, 30, 30, 29, 30, 29, 30, 30),  # 2045
+    (31, 32, 31, 32, 31, 30, 30, 30, 29, 29, 30, 31),  # 2046
+    (31, 31, 31, 32, 31, 31, 30, 29, 30, 29, 30, 30),  # 2047
+    (31, 31, 32, 31, 31, 31, 30, 29, 30, 29, 30, 30),  # 2048
+    (31, 32, 31, 32, 31, 30, 30, 30, 29, 29, 30, 30),  # 2049
+    (31, 32, 31, 32, 31, 30, 30, 30, 29, 30, 29, 31),  # 2050
+    (31, 31, 31, 32, 31, 31, 30, 29, 30, 29, 30, 30),  # 2051
+    (31, 31, 32, 31, 31, 31, 30, 29, 30, 29, 30, 30),  # 2052
+    (31, 32, 31, 32, 31, 30, 30, 30, 29, 29, 30, 30),  # 2053
+    (31, 32, 31, 32, 31, 30, 30, 30, 29, 30, 29, 31),  # 2054
+    (31, 31, 32, 31, 31, 31, 30, 29, 30, 29, 30, 30),  # 2055
+    (31, 31, 32, 31, 32, 30, 30, 29, 30, 29, 30, 30),  # 2056
+    (31, 32, 31, 32, 31, 30, 30, 30, 29, 29, 30, 31),  # 2057
+    (30, 32, 31, 32, 31, 30, 30, 30, 29, 30, 29, 31),  # 2058
+    (31, 31, 32, 31, 31, 31, 30, 29, 30, 29, 30, 30),  # 2059
+    (31, 31, 32, 32, 31, 30, 30, 29, 30, 29, 30, 30),  # 2060
+    (31, 32, 31, 32, 31, 30, 30, 30, 29, 29, 30, 31),  # 2061
+    (31, 31, 31, 32, 31, 31, 29, 30, 29, 30, 29, 31),  # 2062
+    (31, 31, 32, 31, 31, 31, 30, 29, 30, 29, 30, 30),  # 2063
+    (31, 31, 32, 32, 31, 30, 30, 29, 30, 29, 30, 30),  # 2064
+    (31, 32, 31, 32, 31, 30, 30, 30, 29, 29, 30, 31),  # 2065
+    (31, 31, 31, 32, 31, 31, 29, 30, 30, 29, 29, 31),  # 2066
+    (31, 31, 32, 31, 31, 31, 30, 29, 30, 29, 30, 30),  # 2067
+    (31, 31, 32, 32, 31, 30, 30, 29, 30, 29, 30, 30),  # 2068
+    (31, 32, 31, 32, 31, 30, 30, 30, 29, 29, 30, 31),  # 2069
+    (31, 31, 31, 32, 31, 31, 29, 30, 30, 29, 30, 30),  # 2070
+    (31, 31, 32, 31, 31, 31, 30, 29, 30, 29, 30, 30),  # 2071
+    (31, 32, 31, 32, 31, 30, 30, 29, 30, 29, 30, 30),  # 2072
+    (31, 32, 31, 32, 31, 30, 30, 30, 29, 29, 30, 31),  # 2073
+    (31, 31, 31, 32, 31, 31, 30, 29, 30, 29, 30, 30),  # 2074
+    (31, 31, 32, 31, 31, 31, 30, 29, 30, 29, 30, 30),  # 2075
+    (31, 32, 31, 32, 31, 30, 30, 30, 29, 29, 30, 30),  # 2076
+    (31, 32, 31, 32, 31, 30, 30, 30, 29, 30, 29, 31),  # 2077
+    (31, 31, 31, 32, 31, 31, 30, 29, 30, 29, 30, 30),  # 2078
+    (31, 31, 32, 31, 31, 31, 30, 29, 30, 29, 30, 30),  # 2079
+    (31, 32, 31, 32, 31, 30, 30, 30, 29, 29, 30, 30),  # 2080
+    (31, 32, 31, 32, 31, 30, 30, 30, 29, 30, 29, 31),  # 2081
+    (31, 31, 32, 31, 31, 31, 30, 29, 30, 29, 30, 30),  # 2082
+    (31, 31, 32, 31, 31, 31, 30, 29, 30, 29, 30, 30),  # 2083
+    (31, 31, 32, 31, 31, 30, 30, 30, 29, 30, 30, 30),  # 2084
+    (31, 32, 31, 32, 30, 31, 30, 30, 29, 30, 30, 30),  # 2085
+    (30, 32, 31, 32, 31, 30, 30, 30, 29, 30, 30, 30),  # 2086
+    (31, 31, 32, 31, 31, 31, 30, 29, 30, 30, 30, 30),  # 2087
+    (30, 31, 32, 32, 30, 31, 30, 30, 29, 30, 30, 30),  # 2088
+    (30, 32, 31, 32, 31, 30, 30, 30, 29, 30, 30, 30),  # 2089
+    (30, 32, 31, 32, 31, 30, 30, 30, 29, 30, 30, 30),  # 2090
+    (31, 31, 32, 31, 31, 31, 30, 30, 29, 30, 30, 30),  # 2091
+    (30, 31, 32, 32, 31, 30, 30, 30, 29, 30, 30, 30),  # 2092
+    (30, 32, 31, 32, 31, 30, 30, 30, 29, 30, 30, 30),  # 2093
+    (31, 31, 32, 31, 31, 30, 30, 30, 29, 30, 30, 30),  # 2094
+    (31, 31, 32, 31, 31, 31, 30, 29, 30, 30, 30, 30),  # 2095
+    (30, 31, 32, 32, 31, 30, 30, 29, 30, 29, 30, 30),  # 2096
+    (31, 32, 31, 32, 31, 30, 30, 30, 29, 30, 30, 30),  # 2097
+    (31, 31, 32, 31, 31, 31, 29, 30, 29, 30, 29, 31),  # 2098
+    (31, 31, 32, 31, 31, 31, 30, 29, 29, 30, 30, 30),  # 2099
+    (31, 32, 31, 32, 30, 31, 30, 29, 30, 29, 30, 30),  # 2100
+)
+
+BS_MAX_YEAR = BS_MIN_YEAR + len(_BS_MONTH_DAYS) - 1
+
+# Month lengths for every (year, month), flattened: index = (year - BS_MIN_YEAR) * 12 + month - 1
+MONTH_DAYS = array("B", (days for year in _BS_MONTH_DAYS for days in year))
+
+# Days from BS_EPOCH_AD to the first day of each month; the extra last entry
+# is the total number of days in the table
+MONTH_OFFSETS = array("l", accumulate(MONTH_DAYS, initial=0))
+
+AD_MIN = BS_EPOCH_AD
+AD_MAX = BS_EPOCH_AD + timedelta(days=MONTH_OFFSETS[-1] - 1)
+
+
+class BSDate(NamedTuple):
+    """A Bikram Sambat calendar date."""
+    year: int
+    month: int
+    day: int
+
+    def __str__(self) -> str:
+        return f"{self.year:04d}-{self.month:02d}-{self.day:02d}"
+
+
+def _month_index(year: int, month: int) -> int:
+    """Get the flat table index of a BS month, validating the range."""
+    if not BS_MIN_YEAR <= year <= BS_MAX_YEAR:
+        raise ValueError(f"BS year {year} is outside the supported range {BS_MIN_YEAR}-{BS_MAX_YEAR}")
+    if not 1 <= month <= 12:
+        raise ValueError(f"BS month {month} must be between 1 and 12")
+    return (year - BS_MIN_YEAR) * 12 + month - 1
+
+
+def days_in_month(year: int, month: int) -> int:
+    """Get the number of days in a BS month."""
+    return MONTH_DAYS[_month_index(year, month)]
+
+
+def bs_to_ad(year: int, month: int, day: int) -> date:
+    """
+    Convert a BS date to AD.
+
+    Args:
+        year: BS year
+        month: BS month (1-12)
+        day: Day of the month
+
+    Returns:
+        The Gregorian date
+
+    Raises:
+        ValueError: If the date doesn't exist or is outside the table
+    """
+    index = _month_index(year, month)
+    if not 1 <= day <= MONTH_DAYS[index]:
+        raise ValueError(f"BS {year}-{month:02d} has {MONTH_DAYS[index]} days, got day {day}")
+    return BS_EPOCH_AD + timedelta(days=MONTH_OFFSETS[index] + day - 1)
+
+
+def ad_to_bs(value: Union[date, datetime]) -> BSDate:
+    """
+    Convert an AD date to BS.
+
+    Args:
+        value: Gregorian date (the date part of a datetime is used)
+
+    Returns:
+        The BS date
+
+    Raises:
+        ValueError: If the date is outside the table
+    """
+    if isinstance(value, datetime):
+        value = value.date()
+    if not AD_MIN <= value <= AD_MAX:
+        raise ValueError(f"AD date {value} is outside the supported range {AD_MIN} to {AD_MAX}")
+
+    days = (value - BS_EPOCH_AD).days
+    index = bisect_right(MONTH_OFFSETS, days) - 1
+    year, month = divmod(index, 12)
+    return BSDate(BS_MIN_YEAR + year, month + 1, days - MONTH_OFFSETS[index] + 1)
+
+
+def today_bs(now: Optional[datetime] = None) -> BSDate:
+    """Get today's BS date in Nepal."""
+    return ad_to_bs(now or datetime.now(NEPAL_TZ))
+
+
+def parse_bs(text: str) -> BSDate:
+    """Parse a YYYY-MM-DD BS date, accepting Devanagari digits, and validate it."""
+    normalized = "".join(DEVANAGARI_TO_ARABIC.get(c, c) for c in text.strip())
+    try:
+        year, month, day = (int(part) for part in normalized.split("-"))
+    except ValueError:
+        raise ValueError(f"Invalid BS date '{text}', expected YYYY-MM-DD")
+    bs_to_ad(year, month, day)
+    return BSDate(year, month, day)
+
+
+def to_devanagari(value: Union[int, str]) -> str:
+    """Write a number with Devanagari digits."""
+    return "".join(ARABIC_TO_DEVANAGARI.get(c, c) for c in str(value))
+
+
+def describe(bs: BSDate, ad: date) -> Dict:
+    """
+    Describe a converted date for the API.
+
+    Args:
+        bs: BS date
+        ad: The same date in AD
+
+    Returns:
+        Dictionary with both dates, month names and weekday
+    """
+    weekday = WEEKDAY_NAMES[ad.weekday()]
+    return {
+        "ad": ad.isoformat(),
+        "bs": str(bs),
+        "bs_year": bs.year,
+        "bs_month": bs.month,
+        "bs_day": bs.day,
+        "bs_month_name": NUMBERS_TO_MONTH_NAMES[bs.month],
+        "bs_month_name_nepali": NEPALI_MONTHS[bs.month],
+        "weekday": weekday,
+        "nepali_weekday": ENGLISH_TO_NEPALI_WEEKDAYS[weekday],
+    }
+
+
+def month_calendar(year: int, month: int) -> List[Dict]:
+    """
+    Build the days of a BS month without scraping.
+
+    Args:
+        year: BS year
+        month: BS month (1-12)
+
+    Returns:
+        Calendar day dictionaries with the fields of a scraped calendar day;
+        Saturdays are marked as holidays and tithi, event and panchang are empty
+
+    Raises:
+        ValueError: If the month is outside the table
+    """
+    first_day = bs_to_ad(year, month, 1)
+    days = []
+    for day in range(1, days_in_month(year, month) + 1):
+        ad = first_day + timedelta(days=day - 1)
+        weekday = WEEKDAY_NAMES[ad.weekday()]
+        days.append({
+            "year": year,
+            "month": month,
+            "day": day,
+            "nepali_date": f"{year}-{month:02d}-{day:02d}",
+            "english_date": f"{AD_MONTH_ABBREVIATIONS[ad.month - 1]} {ad.day}, {ad.year}",
+            "weekday": weekday,
+            "nepali_weekday": ENGLISH_TO_NEPALI_WEEKDAYS[weekday],
+            "is_holiday": weekday == "Saturday",
+            "event": "",
+            "tithi": "",
+            "panchang": ""
+        })
+    return days
@@ -1,143 +1,175 @@
-import asyncio
 import logging
 from datetime import datetime, timedelta
-from sqlmodel import Session
-from typing import Callable, Coroutine, Any, Dict, List
-from functools import partial
+from typing import Callable, Dict, Optional
 
-from database import engine
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from apscheduler.triggers.cron import CronTrigger
+
+from config import NEPAL_TZ, SCRAPE_SCHEDULES, SCHEDULER_JITTER_SECONDS
+from database.crud import calendar_crud, event_crud, source_state_crud
+from database.executor import run_db
+from cache import panchang_cache, read_model
 from scraping import (
     scrape_rashifal,
     scrape_vegetables,
     scrape_metals,
     scrape_forex,
-    scrape_calendar,
-    scrape_events,
-    scrape_panchang
+    prefetch_calendar,
+    scrape_events
 )
 
 logger = logging.getLogger(__name__)
 
+# Scheduled jobs: name -> (scrape function, CRUD whose last update, together
+# with the last fetch of the sources named after the job, decides whether a
+# run missed while the app was down is caught up at startup).
+# Daily sources have no CRUD here as the startup warm-up already scrapes them.
+# Targets are computed when a job runs (the current BS year, the current year).
+SCHEDULED_JOBS = {
+    "panchang": (panchang_cache.refresh, None),
+    "rashifal": (scrape_rashifal, None),
+    "vegetables": (scrape_vegetables, None),
+    "forex": (scrape_forex, None),
+    "metals": (scrape_metals, None),
+    "calendar": (prefetch_calendar, calendar_crud),
+    "events": (scrape_events, event_crud),
+}
+
+# Window searched for a job's previous run time; covers monthly schedules
+CATCH_UP_LOOKBACK = timedelta(days=32)
+
+
+def cron_trigger(expression: str, jitter: Optional[int] = None) -> CronTrigger:
+    """
+    Build a trigger from a crontab expression evaluated in Nepal time.
+
+    Args:
+        expression: "minute hour day month day_of_week"; use day names as
+            APScheduler numbers weekdays from Monday
+        jitter: Maximum number of seconds added to each run time
+
+    Returns:
+        Cron trigger
+    """
+    minute, hour, day, month, day_of_week = expression.split()
+    return CronTrigger(
+        minute=minute, hour=hour, day=day, month=month, day_of_week=day_of_week,
+        timezone=NEPAL_TZ, jitter=jitter
+    )
+
+
+def previous_fire_time(trigger: CronTrigger, now: datetime) -> Optional[datetime]:
+    """Get the last time at or before `now` the (jitter-free) trigger fired."""
+    previous = None
+    fire_time = trigger.get_next_fire_time(None, now - CATCH_UP_LOOKBACK)
+    while fire_time and fire_time <= now:
+        previous = fire_time
+        fire_time = trigger.get_next_fire_time(fire_time, fire_time + timedelta(seconds=1))
+    return previous
+
+
 class Scheduler:
     """Scheduler for running background scraping tasks."""
-    
+
     def __init__(self):
         self.running = False
-        self.tasks = {}
-    
+        self._scheduler: Optional[AsyncIOScheduler] = None
+
     async def run_scraping_task(self, task_func: Callable, name: str) -> None:
         """Run a scraping task and handle errors."""
         logger.info(f"Running scraping task: {name}")
         try:
-            with Session(engine) as db:
-                await task_func(db)
-            logger.info(f"Completed scraping task: {name}")
+            results = await task_func()
+            if results is None:
+                # The scraper has logged why
+                logger.error(f"Scraping task {name} failed")
+            else:
+                logger.info(f"Completed scraping task: {name}")
+
+            # Publish stored rows, or the check of unchanged pages, to the read
+            # endpoints; a calendar prefetch may fail for some months only
+            await read_model.refresh()
         except Exception as e:
             logger.error(f"Error in scraping task {name}: {str(e)}")
-    
-    async def schedule_task(
-        self, 
-        task_func: Callable[[Session], Coroutine[Any, Any, List[Dict]]], 
-        name: str,
-        interval_hours: float = 24.0,
-        run_immediately: bool = True
-    ) -> None:
-        """Schedule a task to run at specified intervals.
-        
-        For daily changing data like rashifal and prices, we'll rely on the cron job endpoint
-        that will be triggered by cron-job.org every 8 hours.
-        
-        For calendar data, we'll keep a backup scheduler with longer intervals.
-        """
-        # Optionally skip the immediate run for tasks that will be handled by cron jobs
-        if run_immediately:
-            await self.run_scraping_task(task_func, name)
-            
-        # Continue with the scheduled interval
-        while self.running:
-            # Wait for the specified interval
-            await asyncio.sleep(interval_hours * 3600)
-            await self.run_scraping_task(task_func, name)
-    
+
+    async def missed_run(self, name: str, crud, trigger: CronTrigger) -> bool:
+        """Check whether the data was last stored or checked before the job's last scheduled run."""
+        previous = previous_fire_time(trigger, datetime.now(NEPAL_TZ))
+        if previous is None:
+            return False
+        try:
+            # Unchanged pages leave updated_at alone and only move checked_at
+            updated_at = await run_db(crud.get_last_updated)
+            checked_at = await run_db(source_state_crud.get_last_checked, prefix=name)
+        except Exception as e:
+            logger.error(f"Error checking last update for {name}: {str(e)}")
+            return False
+        latest = max(filter(None, (updated_at, checked_at)), default=None)
+        # Both are stored as naive server-local time
+        return latest is None or latest < previous.astimezone().replace(tzinfo=None)
+
     async def start(self) -> None:
         """Start the scheduler.
-        
-        Note: Daily data scraping (rashifal, metals, vegetables, etc.) will primarily be handled
+
+        Note: Daily data scraping (rashifal, metals, vegetables, etc.) is also triggered
         by the external cron job that calls the /cron/scrape endpoint every 8 hours.
-        
-        This scheduler is configured as a backup with longer intervals for redundancy.
+
+        Each job runs on its crontab schedule from SCRAPE_SCHEDULES (Nepal time) with up
+        to SCHEDULER_JITTER_SECONDS of jitter. Runs missed while the process was
+        suspended are run once when it resumes, and jobs with a CRUD in SCHEDULED_JOBS
+        are run right away when their data predates the last scheduled run.
         """
         self.running = True
-        
-        # Schedule daily data tasks with reduced frequency (48 hours) as backup
-        # These will primarily be handled by the cron job every 8 hours
-        # Set run_immediately=False since the initial scraping happens in run_initial_scraping()
-        self.tasks["rashifal"] = asyncio.create_task(
-            self.schedule_task(scrape_rashifal, "rashifal", interval_hours=48.0, run_immediately=False)
-        )
-        self.tasks["vegetables"] = asyncio.create_task(
-            self.schedule_task(scrape_vegetables, "vegetables", interval_hours=48.0, run_immediately=False)
-        )
-        self.tasks["metals"] = asyncio.create_task(
-            self.schedule_task(scrape_metals, "metals", interval_hours=48.0, run_immediately=False)
-        )
-        self.tasks["forex"] = asyncio.create_task(
-            self.schedule_task(scrape_forex, "forex", interval_hours=48.0, run_immediately=False)
-        )
-        self.tasks["panchang"] = asyncio.create_task(
-            self.schedule_task(scrape_panchang, "panchang", interval_hours=48.0, run_immediately=False)
-        )
-        
-        # Calendar and events are scheduled less frequently
-        # For calendar, we'll scrape the current month and the next month
-        now = datetime.now()
-        
-        # Current month calendar (every 7 days to catch updates)
-        self.tasks["calendar_current"] = asyncio.create_task(
-            self.schedule_task(
-                partial(scrape_calendar, year=now.year, month=now.month),
-                "calendar_current",
-                interval_hours=168.0  # 7 days
-            )
-        )
-        
-        # Next month's calendar (scrape at the beginning of each month)
-        next_month = now + timedelta(days=31)
-        next_month = datetime(next_month.year, next_month.month, 1)  # First day of next month
-        self.tasks["calendar_next"] = asyncio.create_task(
-            self.schedule_task(
-                partial(scrape_calendar, year=next_month.year, month=next_month.month),
-                "calendar_next",
-                interval_hours=168.0  # 7 days
-            )
+        self._scheduler = AsyncIOScheduler(
+            timezone=NEPAL_TZ,
+            job_defaults={
+                "coalesce": True,  # Several missed runs collapse into one
+                "max_instances": 1,
+                "misfire_grace_time": None,  # Run missed jobs however late
+            },
         )
-        
-        # Events for the current year (monthly check for updates)
-        self.tasks["events"] = asyncio.create_task(
-            self.schedule_task(
-                partial(scrape_events, year=now.year),
-                "events",
-                interval_hours=720.0  # 30 days
+
+        catch_up = []
+        for name, (task_func, crud) in SCHEDULED_JOBS.items():
+            expression = SCRAPE_SCHEDULES[name]
+            self._scheduler.add_job(
+                self.run_scraping_task,
+                cron_trigger(expression, jitter=SCHEDULER_JITTER_SECONDS),
+                args=[task_func, name],
+                id=name,
+                name=name,
             )
-        )
-        
+            if crud is not None and await self.missed_run(name, crud, cron_trigger(expression)):
+                catch_up.append(name)
+
+        self._scheduler.start()
+
+        # Move caught-up jobs' next run to now; later runs follow the schedule
+        for name in catch_up:
+            logger.info(f"Catching up missed scraping task: {name}")
+            self._scheduler.modify_job(name, next_run_time=datetime.now(NEPAL_TZ))
+
         logger.info("Scheduler started successfully - daily data will be primarily updated by cron job")
-    
+
     async def stop(self) -> None:
         """Stop the scheduler."""
         self.running = False
-        
-        # Cancel all tasks
-        for name, task in self.tasks.items():
-            task.cancel()
-            try:
-                await task
-            except asyncio.CancelledError:
-                pass
-        
-        self.tasks = {}
+
+        if self._scheduler is not None and self._scheduler.running:
+            self._scheduler.shutdown(wait=False)
+        self._scheduler = None
+
         logger.info("Scheduler stopped successfully")
 
+    def next_runs(self) -> Dict[str, Optional[str]]:
+        """Get the next run time of every scheduled job."""
+        if self._scheduler is None:
+            return {}
+        return {
+            job.id: job.next_run_time.isoformat() if job.next_run_time else None
+            for job in self._scheduler.get_jobs()
+        }
+
 
 # Singleton instance
 scheduler = Scheduler()
@@ -12,7 +12,10 @@ from .rashifal import scrape_rashifal
 from .vegetables import scrape_vegetables
 from .metals import scrape_metals
 from .forex import scrape_forex
-from .calendar import scrape_calendar, scrape_hamro_patro, scrape_panchang
+from .calendar import (
+    scrape_calendar, scrape_calendar_year, prefetch_calendar,
+    scrape_hamro_patro, scrape_panchang
+)
 from .events import scrape_events
 
 # Helper function to handle database sessions in scraping functions
@@ -48,6 +51,8 @@ __all__ = [
     "scrape_metals", 
     "scrape_forex", 
     "scrape_calendar", 
+    "scrape_calendar_year",
+    "prefetch_calendar",
     "scrape_events",
     "scrape_hamro_patro",
     "scrape_panchang"
@@ -0,0 +1,91 @@
+"""
+Circuit breaker for upstream hosts.
+
+When a source is down every scrape would otherwise wait for the full HTTP
+timeout before failing. After a few consecutive failures the breaker opens and
+requests to the host fail immediately until a cooldown has passed; then a
+single trial request is let through to probe whether the host is back.
+"""
+import logging
+import time
+from typing import Dict, Union
+
+from config import CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_COOLDOWN_SECONDS, CIRCUIT_MAX_COOLDOWN_SECONDS
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of sending a request to a host whose circuit is open."""
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker for one host.
+
+    closed: requests pass; `failure_threshold` consecutive failures open it.
+    open: requests fail fast for the cooldown, which doubles with every
+        failed trial up to `max_cooldown`.
+    half-open: after the cooldown one trial request passes; its success
+        closes the circuit, its failure opens it again.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+        cooldown: float = CIRCUIT_COOLDOWN_SECONDS,
+        max_cooldown: float = CIRCUIT_MAX_COOLDOWN_SECONDS
+    ):
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.failures = 0
+        self.openings = 0
+        self._open_until = 0.0
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        if self.openings == 0:
+            return "closed"
+        return "open" if time.monotonic() < self._open_until else "half-open"
+
+    @property
+    def retry_in(self) -> float:
+        """Seconds until a trial request is allowed."""
+        return max(0.0, self._open_until - time.monotonic())
+
+    def allow(self) -> bool:
+        """Check whether a request may be sent now; reserves the trial when half-open."""
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "open" or self._trial_in_flight:
+            return False
+        self._trial_in_flight = True
+        return True
+
+    def record_success(self) -> None:
+        if self.openings:
+            logger.info(f"Circuit for {self.name} closed")
+        self.failures = 0
+        self.openings = 0
+        self._open_until = 0.0
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self._trial_in_flight or (self.openings == 0 and self.failures >= self.failure_threshold):
+            self.openings += 1
+            cooldown = min(self.max_cooldown, self.cooldown * 2 ** (self.openings - 1))
+            self._open_until = time.monotonic() + cooldown
+            self._trial_in_flight = False
+            logger.warning(f"Circuit for {self.name} open for {cooldown:.0f} seconds after {self.failures} failures")
+
+    def release(self) -> None:
+        """Give back a trial that ended without a result (e.g. it was cancelled)."""
+        self._trial_in_flight = False
+
+    def describe(self) -> Dict[str, Union[str, int, float]]:
+        return {"state": self.state, "failures": self.failures, "retry_in_seconds": round(self.retry_in, 1)}
@@ -1,44 +1,25 @@
-import httpx
-from bs4 import BeautifulSoup
-from typing import Dict, List, Optional, Tuple
-from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+import asyncio
 import logging
 from sqlmodel import Session
 from dateutil.parser import parse
 import re
 
+from nepali_date import (
+    NEPALI_MONTHS, MONTH_NAMES_TO_NUMBERS, NUMBERS_TO_MONTH_NAMES,
+    DEVANAGARI_TO_ARABIC, BS_MIN_YEAR, BS_MAX_YEAR, month_calendar, today_bs
+)
+from .fetcher import fetcher
+from .dom import parse_html
+from .workers import run_parser
+from .changes import UNCHANGED, fetch_changed, record_content
+from database.executor import run_db
 from database.crud import calendar_crud
+from config import CALENDAR_PREFETCH_CONCURRENCY
 
 logger = logging.getLogger(__name__)
 
-# Nepali month names with English equivalents
-NEPALI_MONTHS = {
-    1: "वैशाख",
-    2: "जेठ",
-    3: "असार",
-    4: "साउन",
-    5: "भदौ",
-    6: "असोज",
-    7: "कार्तिक",
-    8: "मंसिर",
-    9: "पुष",
-    10: "माघ",
-    11: "फागुन",
-    12: "चैत"
-}
-
-# Nepali weekday names with English equivalents
-NEPALI_WEEKDAYS = {
-    "आइतवार": "Sunday",
-    "सोमवार": "Monday",
-    "मङ्गलवार": "Tuesday",
-    "बुधवार": "Wednesday",
-    "बिहिवार": "Thursday",
-    "शुक्रवार": "Friday",
-    "शनिवार": "Saturday"
-}
-
-async def scrape_panchang(db: Session) -> Dict:
+async def scrape_panchang(db: Optional[Session] = None) -> Dict:
     """
     Scrape today's detailed panchang (calendar) information from Ashesh.com.np.
     
@@ -52,129 +33,140 @@ async def scrape_panchang(db: Session) -> Dict:
         # Using Ashesh.com.np's panchang widget
         url = "https://www.ashesh.com.np/panchang/widget.php?header_title=Nepali%20Panchang&header_color=e6e5e2&api=332257p082"
         
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.get(url)
-            response.raise_for_status()
+        response = await fetcher.get(url)
+        response.raise_for_status()
             
-            soup = BeautifulSoup(response.text, "html.parser")
-            
-            # All data is in event div with ev_left and ev_right divs
-            event_rows = soup.select(".event .ev_left, .event .ev_right")
-            
-            # Process the data in pairs (label, value)
-            data = {}
-            for i in range(0, len(event_rows), 2):
-                if i + 1 < len(event_rows):
-                    label = event_rows[i].text.strip()
-                    value = event_rows[i + 1].text.strip()
-                    data[label] = value
-            
-            # Extract specific fields
-            nepali_date = data.get("वि.सं", "")  # वि.सं
-            english_date = data.get("ईसवी", "")  # ईसवी
-            nepal_sambat = data.get("नेपाल संवत", "")  # नेपाल संवत
-            sun_info = data.get("सूर्य", "")  # सूर्य
-            moon_info = data.get("चन्द्र", "")  # चन्द्र
-            tithi = data.get("तिथि", "")  # तिथि
-            paksha = data.get("पक्ष", "")  # पक्ष
-            nakshatra = data.get("नक्षत्र", "")  # नक्षत्र
-            yoga = data.get("योग", "")  # योग
-            karana = data.get("करण", "")  # करण
-            moon_rashi = data.get("चन्द्र राशि", "")  # चन्द्र राशि
-            dinman = data.get("दिनमान", "")  # दिनमान
-            ritu = data.get("ऋतु", "")  # ऋतु
-            ayana = data.get("आयान", "")  # आयान
-            
-            # Parse Nepali date to extract year, month, day, weekday
-            nepali_date_parts = nepali_date.split()
-            nepali_year = nepali_date_parts[0] if len(nepali_date_parts) > 0 else ""
-            nepali_month = nepali_date_parts[1] if len(nepali_date_parts) > 1 else ""
-            nepali_day = nepali_date_parts[2] if len(nepali_date_parts) > 2 else ""
-            nepali_weekday = nepali_date_parts[3] if len(nepali_date_parts) > 3 else ""
-            
-            # Parse English date
-            english_date_parts = english_date.split()
-            english_year = english_date_parts[0] if len(english_date_parts) > 0 else ""
-            english_month = english_date_parts[1] if len(english_date_parts) > 1 else ""
-            english_day = english_date_parts[2].rstrip(",") if len(english_date_parts) > 2 else ""
-            english_weekday = english_date_parts[3] if len(english_date_parts) > 3 else ""
-            
-            # Extract sunrise, sunset, moonrise, moonset times
-            sunrise = ""
-            sunset = ""
-            moonrise = ""
-            moonset = ""
-            
-            if sun_info:
-                sun_parts = re.findall(r'(\d+:\d+)\S*', sun_info)
-                if len(sun_parts) >= 2:
-                    sunrise = sun_parts[0]
-                    sunset = sun_parts[1]
-            
-            if moon_info:
-                moon_parts = re.findall(r'(\d+:\d+ (?:AM|PM))\S*', moon_info)
-                if len(moon_parts) >= 2:
-                    moonrise = moon_parts[0]
-                    moonset = moon_parts[1]
-            
-            # Format sun and moon info
-            sun_moon_formatted = ""
-            if sunrise and sunset and moonrise and moonset:
-                sun_moon_formatted = f"☀ {sunrise}, {sunset}◑ {moonrise}, {moonset}"
-            
-            # Get events or tithi for the day
-            event = tithi.split("upto")[0].strip() if tithi else ""
-            
-            # Get month number from month name
-            month_num = None
-            for num, name in NEPALI_MONTHS.items():
-                if name == nepali_month:
-                    month_num = num
-                    break
-            
-            # Construct the result
-            today_info = {
-                "nepali_date": nepali_date,
-                "english_date": english_date,
-                "nepal_sambat": nepal_sambat,
-                "tithi": tithi,
-                "paksha": paksha,
-                "nakshatra": nakshatra,
-                "yoga": yoga,
-                "karana": karana,
-                "moon_rashi": moon_rashi,
-                "dinman": dinman,
-                "ritu": ritu,
-                "ayana": ayana,
-                "sunrise": sunrise,
-                "sunset": sunset,
-                "moonrise": moonrise,
-                "moonset": moonset,
-                "sun_moon_info": sun_moon_formatted,
-                "nepali_year": nepali_year,
-                "nepali_month": nepali_month,
-                "nepali_month_num": month_num,
-                "nepali_day": nepali_day,
-                "nepali_weekday": nepali_weekday,
-                "english_year": english_year,
-                "english_month": english_month,
-                "english_day": english_day,
-                "english_weekday": english_weekday,
-                "event": event,
-                # Formatted strings for display
-                "nepali_date_text": f"नेपाली पात्रो{english_day}-{english_month}-{english_year}",
-                "today_text": f"आज {nepali_year} {nepali_month}",
-                "weekday_tithi": f"{nepali_weekday}, {event}"
-            }
-            
-            return today_info
+        return await run_parser(parse_panchang, response.content)
     
     except Exception as e:
         logger.error(f"Error scraping Panchang: {str(e)}")
         return {}
 
+def parse_panchang(html: bytes) -> Dict:
+    """
+    Parse the Ashesh.com.np panchang widget page.
+
+    Args:
+        html: Raw page body
+
+    Returns:
+        Dictionary with today's panchang information
+    """
+    soup = parse_html(html)
+
+    # All data is in event div with ev_left and ev_right divs
+    event_rows = soup.select(".event .ev_left, .event .ev_right")
+
+    # Process the data in pairs (label, value)
+    data = {}
+    for i in range(0, len(event_rows), 2):
+        if i + 1 < len(event_rows):
+            label = event_rows[i].text.strip()
+            value = event_rows[i + 1].text.strip()
+            data[label] = value
+
+    # Extract specific fields
+    nepali_date = data.get("वि.सं", "")  # वि.सं
+    english_date = data.get("ईसवी", "")  # ईसवी
+    nepal_sambat = data.get("नेपाल संवत", "")  # नेपाल संवत
+    sun_info = data.get("सूर्य", "")  # सूर्य
+    moon_info = data.get("चन्द्र", "")  # चन्द्र
+    tithi = data.get("तिथि", "")  # तिथि
+    paksha = data.get("पक्ष", "")  # पक्ष
+    nakshatra = data.get("नक्षत्र", "")  # नक्षत्र
+    yoga = data.get("योग", "")  # योग
+    karana = data.get("करण", "")  # करण
+    moon_rashi = data.get("चन्द्र राशि", "")  # चन्द्र राशि
+    dinman = data.get("दिनमान", "")  # दिनमान
+    ritu = data.get("ऋतु", "")  # ऋतु
+    ayana = data.get("आयान", "")  # आयान
+
+    # Parse Nepali date to extract year, month, day, weekday
+    nepali_date_parts = nepali_date.split()
+    nepali_year = nepali_date_parts[0] if len(nepali_date_parts) > 0 else ""
+    nepali_month = nepali_date_parts[1] if len(nepali_date_parts) > 1 else ""
+    nepali_day = nepali_date_parts[2] if len(nepali_date_parts) > 2 else ""
+    nepali_weekday = nepali_date_parts[3] if len(nepali_date_parts) > 3 else ""
+
+    # Parse English date
+    english_date_parts = english_date.split()
+    english_year = english_date_parts[0] if len(english_date_parts) > 0 else ""
+    english_month = english_date_parts[1] if len(english_date_parts) > 1 else ""
+    english_day = english_date_parts[2].rstrip(",") if len(english_date_parts) > 2 else ""
+    english_weekday = english_date_parts[3] if len(english_date_parts) > 3 else ""
+
+    # Extract sunrise, sunset, moonrise, moonset times
+    sunrise = ""
+    sunset = ""
+    moonrise = ""
+    moonset = ""
+
+    if sun_info:
+        sun_parts = re.findall(r'(\d+:\d+)\S*', sun_info)
+        if len(sun_parts) >= 2:
+            sunrise = sun_parts[0]
+            sunset = sun_parts[1]
+
+    if moon_info:
+        moon_parts = re.findall(r'(\d+:\d+ (?:AM|PM))\S*', moon_info)
+        if len(moon_parts) >= 2:
+            moonrise = moon_parts[0]
+            moonset = moon_parts[1]
+
+    # Format sun and moon info
+    sun_moon_formatted = ""
+    if sunrise and sunset and moonrise and moonset:
+        sun_moon_formatted = f"☀ {sunrise}, {sunset}◑ {moonrise}, {moonset}"
+
+    # Get events or tithi for the day
+    event = tithi.split("upto")[0].strip() if tithi else ""
+
+    # Get month number from month name
+    month_num = None
+    for num, name in NEPALI_MONTHS.items():
+        if name == nepali_month:
+            month_num = num
+            break
+
+    # Construct the result
+    today_info = {
+        "nepali_date": nepali_date,
+        "english_date": english_date,
+        "nepal_sambat": nepal_sambat,
+        "tithi": tithi,
+        "paksha": paksha,
+        "nakshatra": nakshatra,
+        "yoga": yoga,
+        "karana": karana,
+        "moon_rashi": moon_rashi,
+        "dinman": dinman,
+        "ritu": ritu,
+        "ayana": ayana,
+        "sunrise": sunrise,
+        "sunset": sunset,
+        "moonrise": moonrise,
+        "moonset": moonset,
+        "sun_moon_info": sun_moon_formatted,
+        "nepali_year": nepali_year,
+        "nepali_month": nepali_month,
+        "nepali_month_num": month_num,
+        "nepali_day": nepali_day,
+        "nepali_weekday": nepali_weekday,
+        "english_year": english_year,
+        "english_month": english_month,
+        "english_day": english_day,
+        "english_weekday": english_weekday,
+        "event": event,
+        # Formatted strings for display
+        "nepali_date_text": f"नेपाली पात्रो{english_day}-{english_month}-{english_year}",
+        "today_text": f"आज {nepali_year} {nepali_month}",
+        "weekday_tithi": f"{nepali_weekday}, {event}"
+    }
+
+    return today_info
+
 # Keep original function for backward compatibility
-async def scrape_hamro_patro(db: Session) -> Dict:
+async def scrape_hamro_patro(db: Optional[Session] = None) -> Dict:
     """
     Scrape today's detailed date information.
     This is now a wrapper around scrape_panchang for backward compatibility.
@@ -187,185 +179,248 @@ async def scrape_hamro_patro(db: Session) -> Dict:
     """
     return await scrape_panchang(db)
 
-async def scrape_calendar(db: Session, year: int = None, month: int = None) -> List[Dict]:
+def parse_day_annotations(soup) -> Dict[int, Dict]:
     """
-    Scrape Nepali calendar days for a specific month from Ashesh.com.np.
+    Extract the per-day annotations (tithi, events, holiday flag) of a calendar page.
     
     Args:
-        db: Database session
-        year: Optional year to scrape (defaults to current year)
-        month: Optional month to scrape (defaults to current month)
+        soup: Parsed calendar page
+
+    Returns:
+        Annotations keyed by day of the month
+    """
+    annotations = {}
+
+    # Find all day cells in the calendar table
+    for day_cell in soup.select("#calendartable td"):
+        try:
+            # Check if this cell has a date (cells without dates are empty or have headers)
+            date_np_elem = day_cell.select_one(".date_np")
+            if not date_np_elem:
+                continue
+
+            # Extract Nepali day number, converting Devanagari digits to Arabic
+            nepali_day_str = date_np_elem.text.strip()
+            nepali_day = int(''.join([DEVANAGARI_TO_ARABIC.get(c, c) for c in nepali_day_str]))
+
+            # Extract events
+            event_one_elem = day_cell.select_one(".event_one")
+            rotate_left_elem = day_cell.select_one(".rotate_left")
+            rotate_right_elem = day_cell.select_one(".rotate_right")
+
+            events = []
+            if event_one_elem and event_one_elem.text.strip() != "\xa0":
+                events.append(event_one_elem.text.strip())
+            if rotate_left_elem and rotate_left_elem.text.strip():
+                events.append(rotate_left_elem.text.strip())
+            if rotate_right_elem and rotate_right_elem.text.strip():
+                events.append(rotate_right_elem.text.strip())
+
+            # Extract tithi
+            tithi_elem = day_cell.select_one(".tithi")
+            tithi = tithi_elem.text.strip() if tithi_elem else ""
+
+            # Holidays (Saturdays included) are styled in red
+            styles = [day_cell.get("style", ""), date_np_elem.get("style", ""),
+                      tithi_elem.get("style", "") if tithi_elem else ""]
+            is_holiday = any("#FF4D00" in style.replace(" ", "") for style in styles)
+
+            annotations[nepali_day] = {
+                "event": ", ".join([e for e in events if e]),
+                "tithi": tithi,
+                "is_holiday": is_holiday
+            }
+
+        except (ValueError, AttributeError) as e:
+            logger.warning(f"Error parsing day cell: {str(e)}")
+
+    return annotations
+
+def merge_annotations(days: List[Dict], annotations: Dict[int, Dict]) -> List[Dict]:
+    """
+    Merge scraped annotations into locally built calendar days.
+
+    Args:
+        days: Days from nepali_date.month_calendar
+        annotations: Annotations keyed by day of the month
+
+    Returns:
+        The same day dictionaries, updated in place
+    """
+    for calendar_day in days:
+        annotation = annotations.get(calendar_day["day"])
+        if not annotation:
+            continue
+        calendar_day["event"] = annotation["event"]
+        calendar_day["tithi"] = annotation["tithi"]
+        # There's no separate panchang section, so it's built from the tithi
+        calendar_day["panchang"] = f"पञ्चाङ्ग: {annotation['tithi']}" if annotation["tithi"] else ""
+        calendar_day["is_holiday"] = calendar_day["is_holiday"] or annotation["is_holiday"]
+
+    extra_days = sorted(set(annotations) - {calendar_day["day"] for calendar_day in days})
+    if extra_days:
+        logger.warning(f"Calendar page has days {extra_days} beyond the local month length")
+
+    return days
+
+def parse_calendar(html: bytes, year: int, month: int) -> List[Dict]:
+    """
+    Parse an Ashesh.com.np calendar month page.
+
+    Days, weekdays and AD dates come from the local BS calendar; the page only
+    provides the tithi, events and holidays of each day.
+
+    Args:
+        html: Raw page body
+        year: Requested year, used when the page header can't be parsed
+        month: Requested month, used when the page header can't be parsed
         
     Returns:
         List of calendar day data dictionaries
     """
-    results = []
+    soup = parse_html(html)
+
+    # Extract the Nepali month and year from the header
+    nepali_month_year_elem = soup.select_one(".cal_left")
+    nepali_month_year = nepali_month_year_elem.text.strip() if nepali_month_year_elem else ""
+
+    # Parse the Nepali year and month
+    nepali_month_name = ""
+    nepali_year = year
+    if nepali_month_year:
+        # Format is like "JESTHA २०८२" - extract the last part as year
+        parts = nepali_month_year.split()
+        if len(parts) >= 2:
+            # Convert Devanagari digits to Arabic numerals
+            nepali_year_str = parts[-1]
+            arabic_year = ''.join([DEVANAGARI_TO_ARABIC.get(c, c) for c in nepali_year_str])
+            nepali_year = int(arabic_year) if arabic_year.isdigit() else year
+
+            # Get the month name
+            nepali_month_name = parts[0] if len(parts) > 0 else ""
+
+    # Convert month name to number
+    nepali_month = MONTH_NAMES_TO_NUMBERS.get(nepali_month_name, month)
     
-    # If no year/month provided, use current date
-    if not year or not month:
-        now = datetime.now()
-        year = now.year
-        month = now.month
+    try:
+        days = month_calendar(nepali_year, nepali_month)
+    except ValueError as e:
+        logger.warning(f"Can't build calendar for {nepali_year}-{nepali_month}: {str(e)}")
+        return []
     
-    # Map English month names to month numbers for the API call
-    month_names_to_numbers = {
-        "Baishakh": 1, "Jestha": 2, "Ashadh": 3, "Shrawan": 4,
-        "Bhadra": 5, "Ashwin": 6, "Kartik": 7, "Mangsir": 8,
-        "Poush": 9, "Magh": 10, "Falgun": 11, "Chaitra": 12
-    }
+    return merge_annotations(days, parse_day_annotations(soup))
+
+async def scrape_calendar(db: Optional[Session] = None, year: int = None, month: int = None) -> Optional[List[Dict]]:
+    """
+    Scrape Nepali calendar days for a specific month from Ashesh.com.np.
     
-    # Map from month number to English month name for API call
-    numbers_to_month_names = {
-        1: "Baishakh", 2: "Jestha", 3: "Ashadh", 4: "Shrawan",
-        5: "Bhadra", 6: "Ashwin", 7: "Kartik", 8: "Mangsir",
-        9: "Poush", 10: "Magh", 11: "Falgun", 12: "Chaitra"
-    }
+    Args:
+        db: Optional database session (a short-lived one is opened when omitted)
+        year: Optional BS year to scrape (defaults to the current BS year)
+        month: Optional BS month to scrape (defaults to the current BS month)
+
+    Returns:
+        List of calendar day data dictionaries stored, empty if the page is unchanged,
+        or None if the scrape failed
+    """
+    # If no year/month provided, use today's BS date
+    if not year or not month:
+        today = today_bs()
+        year = today.year
+        month = today.month
+
+    # Annotations can only be stored on months of the local calendar table
+    if not BS_MIN_YEAR <= year <= BS_MAX_YEAR:
+        logger.warning(f"BS year {year} is outside the calendar table ({BS_MIN_YEAR}-{BS_MAX_YEAR}), not scraping it")
+        return None
     
     try:
         # Using Ashesh.com.np for the calendar
-        month_name = numbers_to_month_names.get(month, "Baishakh")
+        month_name = NUMBERS_TO_MONTH_NAMES.get(month, "Baishakh")
         url = f"https://www.ashesh.com.np/nepali-calendar/calendar.php?api=332256p082&year={year}&month={month_name}"
         
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.get(url)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.text, "html.parser")
-            
-            # Extract the Nepali month and year from the header
-            nepali_month_year_elem = soup.select_one(".cal_left")
-            english_month_year_elem = soup.select_one(".cal_right")
+        # Conditional fetch; unchanged pages are neither parsed nor written
+        source = f"calendar:{year}-{month:02d}"
+        page = await fetch_changed(source, url)
+        if page is UNCHANGED:
+            return []
+        response, digest = page
             
-            nepali_month_year = nepali_month_year_elem.text.strip() if nepali_month_year_elem else ""
-            english_month_year = english_month_year_elem.text.strip() if english_month_year_elem else ""
-            
-            # Parse the Nepali year and month
-            nepali_month_name = ""
-            nepali_year = year
-            if nepali_month_year:
-                # Format is like "JESTHA २०८२" - extract the last part as year
-                parts = nepali_month_year.split()
-                if len(parts) >= 2:
-                    # Convert Devanagari digits to Arabic numerals
-                    devanagari_to_arabic = {
-                        '०': '0', '१': '1', '२': '2', '३': '3', '४': '4',
-                        '५': '5', '६': '6', '७': '7', '८': '8', '९': '9'
-                    }
-                    nepali_year_str = parts[-1]
-                    arabic_year = ''.join([devanagari_to_arabic.get(c, c) for c in nepali_year_str])
-                    nepali_year = int(arabic_year) if arabic_year.isdigit() else year
-                    
-                    # Get the month name
-                    nepali_month_name = parts[0] if len(parts) > 0 else ""
-                    
-            # Convert month name to number
-            nepali_month = month_names_to_numbers.get(nepali_month_name, month)
-            
-            # Find all day cells in the calendar table
-            day_cells = soup.select("#calendartable td")
-            
-            for day_cell in day_cells:
-                try:
-                    # Check if this cell has a date (cells without dates are empty or have headers)
-                    date_np_elem = day_cell.select_one(".date_np")
-                    if not date_np_elem:
-                        continue
-                    
-                    # Extract Nepali day number
-                    nepali_day_str = date_np_elem.text.strip()
-                    # Convert Devanagari digits to Arabic
-                    nepali_day_arabic = ''.join([devanagari_to_arabic.get(c, c) for c in nepali_day_str])
-                    nepali_day = int(nepali_day_arabic)
-                    
-                    # Extract English date
-                    date_en_elem = day_cell.select_one(".date_en")
-                    english_day = date_en_elem.text.strip() if date_en_elem else ""
-                    
-                    # Extract events
-                    event_one_elem = day_cell.select_one(".event_one")
-                    rotate_left_elem = day_cell.select_one(".rotate_left")
-                    rotate_right_elem = day_cell.select_one(".rotate_right")
-                    
-                    events = []
-                    if event_one_elem and event_one_elem.text.strip() != "\xa0":
-                        events.append(event_one_elem.text.strip())
-                    if rotate_left_elem and rotate_left_elem.text.strip():
-                        events.append(rotate_left_elem.text.strip())
-                    if rotate_right_elem and rotate_right_elem.text.strip():
-                        events.append(rotate_right_elem.text.strip())
-                    
-                    event = ", ".join([e for e in events if e])
-                    
-                    # Extract tithi
-                    tithi_elem = day_cell.select_one(".tithi")
-                    tithi = tithi_elem.text.strip() if tithi_elem else ""
-                    
-                    # Determine if it's a holiday - Saturdays and days with special style
-                    is_holiday = "color:#FF4D00" in day_cell.get("style", "") or \
-                               day_cell.get("style", "") == "color:#FF4D00" or \
-                               "style='color: #FF4D00'" in str(date_np_elem) or \
-                               "style='color:#FF4D00'" in str(tithi_elem)
-                    
-                    # Get weekday based on the table column (0-indexed, where 0 = Sunday)
-                    weekday_map = ["Sunday", "Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday"]
-                    
-                    # Try to determine the weekday based on column position
-                    weekday_index = -1
-                    parent_row = day_cell.parent
-                    if parent_row and parent_row.name == "tr":
-                        cells = parent_row.select("td")
-                        weekday_index = cells.index(day_cell) if day_cell in cells else -1
-                    
-                    english_weekday = weekday_map[weekday_index] if 0 <= weekday_index < len(weekday_map) else ""
-                    nepali_weekday = [k for k, v in NEPALI_WEEKDAYS.items() if v == english_weekday][0] if english_weekday in NEPALI_WEEKDAYS.values() else ""
-                    
-                    # Format dates properly
-                    nepali_date = f"{nepali_year}-{nepali_month:02d}-{nepali_day:02d}"
-                    
-                    # Parse English month/year format (e.g., "MAY-JUN 2025")
-                    english_month = ""
-                    english_year = ""
-                    if english_month_year:
-                        # Format is like "MAY-JUN 2025"
-                        if "-" in english_month_year and " " in english_month_year:
-                            english_year = english_month_year.split()[-1]
-                            english_months = english_month_year.split()[0]
-                            english_month = english_months.split("-")[0] if "-" in english_months else english_months
-                    
-                    # Construct a proper English date string
-                    month_name_to_num = {
-                        "JAN": 1, "FEB": 2, "MAR": 3, "APR": 4, "MAY": 5, "JUN": 6,
-                        "JUL": 7, "AUG": 8, "SEP": 9, "OCT": 10, "NOV": 11, "DEC": 12
-                    }
-                    english_month_num = month_name_to_num.get(english_month, 1)
-                    full_english_date = f"{english_month} {english_day}, {english_year}"
-                    
-                    # Extract panchang - combine tithi with events as there's no specific panchang section
-                    panchang = f"पञ्चाङ्ग: {tithi}" if tithi else ""
-                    
-                    calendar_data = {
-                        "year": nepali_year,
-                        "month": nepali_month,
-                        "day": nepali_day,
-                        "nepali_date": nepali_date,
-                        "english_date": full_english_date,
-                        "weekday": english_weekday,
-                        "nepali_weekday": nepali_weekday,
-                        "is_holiday": is_holiday,
-                        "event": event,
-                        "tithi": tithi,
-                        "panchang": panchang
-                    }
-                    
-                    # Save to database
-                    calendar_crud.upsert(db=db, obj_in=calendar_data)
-                    results.append(calendar_data)
-                    
-                except (ValueError, AttributeError) as e:
-                    logger.warning(f"Error parsing day cell: {str(e)}")
+        results = await run_parser(parse_calendar, response.content, year, month)
+        if not results:
+            # An error page or a changed layout is a failed check, not an unchanged page
+            logger.error(f"No calendar days for {year}-{month} found in the page, not recording it")
+            return None
             
+        # Save all rows in a single transaction
+        await run_db(calendar_crud.bulk_upsert, results, db=db)
+        await record_content(source, url, response, digest)
+
         return results
     
     except Exception as e:
         logger.error(f"Error scraping calendar for {year}-{month}: {str(e)}")
-        return []
+        return None
+
+
+async def scrape_calendar_months(
+    months: Iterable[Tuple[int, int]],
+    concurrency: int = CALENDAR_PREFETCH_CONCURRENCY
+) -> Optional[List[Dict]]:
+    """
+    Scrape several calendar months concurrently.
+
+    Each month is stored in its own short-lived session, as one session can't
+    be used from several database threads at once.
+
+    Args:
+        months: (BS year, BS month) pairs to scrape
+        concurrency: Maximum number of months scraped at the same time
+
+    Returns:
+        Calendar day data dictionaries stored for all months, or None if any
+        month failed
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def scrape_month(year: int, month: int) -> Optional[List[Dict]]:
+        async with semaphore:
+            return await scrape_calendar(year=year, month=month)
+
+    results = await asyncio.gather(*(scrape_month(year, month) for year, month in months))
+    failed = sum(days is None for days in results)
+    if failed:
+        logger.error(f"{failed} of {len(results)} calendar months failed to scrape")
+        return None
+    return [day for days in results for day in days]
+
+async def scrape_calendar_year(year: int = None, months: Iterable[int] = range(1, 13)) -> Optional[List[Dict]]:
+    """
+    Scrape the months of a BS year concurrently.
+
+    Args:
+        year: BS year to scrape (defaults to the current BS year)
+        months: BS months to scrape (defaults to all 12)
+
+    Returns:
+        Calendar day data dictionaries stored for those months, or None if any
+        month failed
+    """
+    year = year or today_bs().year
+    return await scrape_calendar_months((year, month) for month in months)
+
+async def prefetch_calendar() -> Optional[List[Dict]]:
+    """
+    Scrape every month of the current and next BS years so year views stay warm.
+
+    Returns:
+        Calendar day data dictionaries stored for both years, or None if any
+        month failed
+    """
+    year = today_bs().year
+    results = await scrape_calendar_months(
+        (y, month) for y in (year, year + 1) for month in range(1, 13)
+    )
+    if results is not None:
+        logger.info(f"Prefetched {len(results)} calendar days for BS {year} and {year + 1}")
+    return results
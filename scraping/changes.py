@@ -0,0 +1,120 @@
+"""
+Change detection for scraped pages.
+
+Most sources publish once a day while they are scraped several times a day.
+Pages are fetched with the `ETag`/`Last-Modified` validators stored for the
+source, so a server answering 304 Not Modified ends the scrape without a
+download. Otherwise the page body is hashed together with whatever else goes
+into its rows (such as the date they are stored under) and compared with the
+hash kept in `SourceState`; an unchanged page skips parsing and the database
+write entirely.
+"""
+import hashlib
+import logging
+from typing import Sequence, Tuple, Union
+
+import httpx
+
+from database.crud import source_state_crud
+from database.executor import run_db
+from .fetcher import fetcher
+
+logger = logging.getLogger(__name__)
+
+# Returned by `fetch_changed` for an unchanged page; fetch errors raise instead
+UNCHANGED = object()
+
+
+def content_hash(body: bytes, *context: str) -> str:
+    """
+    Hash a page body and its parse context.
+
+    Args:
+        body: Raw page body
+        context: Other parse inputs, e.g. the date the rows are stored under
+
+    Returns:
+        Hex digest
+    """
+    digest = hashlib.sha256(body)
+    for value in context:
+        digest.update(b"\0" + str(value).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _validators(url: str, response: httpx.Response) -> dict:
+    return {
+        "url": url,
+        "etag": response.headers.get("etag"),
+        "last_modified": response.headers.get("last-modified"),
+    }
+
+
+async def fetch_changed(
+    source: str,
+    url: str,
+    context: Sequence[str] = (),
+    **kwargs
+) -> Union[Tuple[httpx.Response, str], object]:
+    """
+    Fetch a source page unless it is unchanged since its rows were stored.
+
+    Validators are only sent when the stored rows were built with the same
+    `context`, so e.g. a new day still gets its rows from an unchanged page.
+    Unchanged pages still count as a successful check of the source.
+
+    Args:
+        source: Source identifier, e.g. "metals" or "calendar:2082-02"
+        url: Page URL
+        context: Other parse inputs the rows depend on
+        **kwargs: Passed to `fetcher.get`
+
+    Returns:
+        (response, content hash) of a changed page, or `UNCHANGED`
+
+    Raises:
+        httpx.HTTPStatusError: The server answered with an error status
+    """
+    context_key = "\0".join(str(value) for value in context)
+    state = await run_db(source_state_crud.get, source)
+
+    headers = dict(kwargs.pop("headers", None) or {})
+    if state is not None and state.content_hash and state.context == context_key and state.url == url:
+        if state.etag:
+            headers["If-None-Match"] = state.etag
+        if state.last_modified:
+            headers["If-Modified-Since"] = state.last_modified
+
+    response = await fetcher.get(url, headers=headers, **kwargs)
+    if response.status_code == 304:
+        await run_db(source_state_crud.record, source=source, obj_in={"url": url})
+        # A server may answer 304 without being sent validators
+        since = state.changed_at if state is not None else "the last check"
+        logger.info(f"Page for {source} not modified since {since}, skipping scrape")
+        return UNCHANGED
+    response.raise_for_status()
+
+    digest = content_hash(response.content, *context)
+    if state is not None and state.content_hash == digest:
+        await run_db(source_state_crud.record, source=source, content_hash=digest, obj_in=_validators(url, response))
+        logger.info(f"Page for {source} unchanged since {state.changed_at}, skipping parse and write")
+        return UNCHANGED
+    return response, digest
+
+
+async def record_content(
+    source: str,
+    url: str,
+    response: httpx.Response,
+    digest: str,
+    context: Sequence[str] = ()
+) -> None:
+    """Remember the hash and validators of a page once its rows are stored.
+
+    Only pages that produced rows are recorded; a page that parses to nothing
+    (an error page, a changed layout) must not count as a good check.
+    """
+    await run_db(
+        source_state_crud.record, source=source, content_hash=digest,
+        obj_in={**_validators(url, response), "context": "\0".join(str(value) for value in context)}
+    )
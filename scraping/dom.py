@@ -0,0 +1,233 @@
+"""
+Small DOM facade over the HTML parser backends used by the scrapers.
+
+The parse functions only need CSS selection, text, attributes and the parent
+element, so they are written against `Node` and the backend is picked once at
+import time. selectolax (lexbor) is the default as it is several times faster
+than BeautifulSoup; set HTML_PARSER=bs4 to switch back to BeautifulSoup with
+the stdlib "html.parser".
+"""
+import logging
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Union
+
+from config import HTML_PARSER
+
+logger = logging.getLogger(__name__)
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:  # pragma: no cover - depends on the installed wheels
+    LexborHTMLParser = None
+
+try:
+    from bs4 import BeautifulSoup
+except ImportError:  # pragma: no cover - depends on the installed wheels
+    BeautifulSoup = None
+
+
+class Node(ABC):
+    """Backend-neutral view of an HTML element.
+
+    Mirrors the subset of the BeautifulSoup API the scrapers used before:
+    `select` only matches descendants and `text` is the concatenated text of
+    the element and its descendants.
+    """
+
+    __slots__ = ("_node",)
+
+    def __init__(self, node):
+        self._node = node
+
+    @abstractmethod
+    def select(self, selector: str) -> List["Node"]:
+        """Get all descendants matching a CSS selector, in document order."""
+
+    @abstractmethod
+    def select_one(self, selector: str) -> Optional["Node"]:
+        """Get the first descendant matching a CSS selector."""
+
+    @property
+    @abstractmethod
+    def text(self) -> str:
+        """Text of the element and its descendants."""
+
+    @property
+    @abstractmethod
+    def tag(self) -> str:
+        """Tag name."""
+
+    @property
+    @abstractmethod
+    def attrs(self) -> Dict[str, str]:
+        """Attribute values; multi-valued ones such as class joined by spaces."""
+
+    @property
+    @abstractmethod
+    def parent(self) -> Optional["Node"]:
+        """Parent element, None at the root."""
+
+    @property
+    @abstractmethod
+    def html(self) -> str:
+        """Outer HTML of the element."""
+
+    @property
+    def classes(self) -> List[str]:
+        return (self.attrs.get("class") or "").split()
+
+    def get(self, name: str, default: Optional[str] = None) -> Optional[str]:
+        """Get an attribute value, or `default` when it is missing."""
+        value = self.attrs.get(name)
+        return default if value is None else value
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__} {self.tag}>"
+
+
+class LexborNode(Node):
+    """`Node` backed by a selectolax lexbor node."""
+
+    __slots__ = ()
+
+    def select(self, selector: str) -> List[Node]:
+        # lexbor includes the context node itself when it matches (the document
+        # wrapper has no mem_id) and repeats nodes matched by several
+        # selectors of a group, bs4 does neither
+        seen = {getattr(self._node, "mem_id", None)}
+        matches = []
+        for node in self._node.css(selector):
+            if node.mem_id not in seen:
+                seen.add(node.mem_id)
+                matches.append(LexborNode(node))
+        return matches
+
+    def select_one(self, selector: str) -> Optional[Node]:
+        node = self._node.css_first(selector)
+        if node is not None and node.mem_id == getattr(self._node, "mem_id", None):
+            matches = self.select(selector)
+            return matches[0] if matches else None
+        return LexborNode(node) if node is not None else None
+
+    @property
+    def text(self) -> str:
+        return self._node.text(deep=True)
+
+    @property
+    def tag(self) -> str:
+        return self._node.tag
+
+    @property
+    def attrs(self) -> Dict[str, str]:
+        return {k: v if v is not None else "" for k, v in self._node.attributes.items()}
+
+    @property
+    def parent(self) -> Optional[Node]:
+        node = self._node.parent
+        return LexborNode(node) if node is not None else None
+
+    @property
+    def html(self) -> str:
+        return self._node.html or ""
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, LexborNode) and self._node.mem_id == other._node.mem_id
+
+    def __hash__(self) -> int:
+        return hash(self._node.mem_id)
+
+
+class SoupNode(Node):
+    """`Node` backed by a BeautifulSoup tag."""
+
+    __slots__ = ()
+
+    def select(self, selector: str) -> List[Node]:
+        return [SoupNode(n) for n in self._node.select(selector)]
+
+    def select_one(self, selector: str) -> Optional[Node]:
+        node = self._node.select_one(selector)
+        return SoupNode(node) if node is not None else None
+
+    @property
+    def text(self) -> str:
+        return self._node.get_text()
+
+    @property
+    def tag(self) -> str:
+        return self._node.name
+
+    @property
+    def attrs(self) -> Dict[str, str]:
+        # bs4 returns multi-valued attributes such as class as lists
+        return {k: " ".join(v) if isinstance(v, list) else v for k, v in self._node.attrs.items()}
+
+    @property
+    def parent(self) -> Optional[Node]:
+        node = self._node.parent
+        return SoupNode(node) if node is not None else None
+
+    @property
+    def html(self) -> str:
+        return str(self._node)
+
+    def __eq__(self, other) -> bool:
+        # Identity, not bs4's structural equality
+        return isinstance(other, SoupNode) and self._node is other._node
+
+    def __hash__(self) -> int:
+        return id(self._node)
+
+
+class Document:
+    """A parsed page: the root for selection plus the `<body>` element."""
+
+    __slots__ = ("root", "body")
+
+    def __init__(self, root: Node, body: Optional[Node]):
+        self.root = root
+        self.body = body
+
+    def select(self, selector: str) -> List[Node]:
+        return self.root.select(selector)
+
+    def select_one(self, selector: str) -> Optional[Node]:
+        return self.root.select_one(selector)
+
+
+def _resolve_backend(name: str) -> str:
+    """Pick an installed backend, preferring `name`."""
+    available = {"selectolax": LexborHTMLParser is not None, "bs4": BeautifulSoup is not None}
+    if available.get(name):
+        return name
+    for fallback, ok in available.items():
+        if ok:
+            logger.warning(f"HTML parser '{name}' unavailable, using '{fallback}'")
+            return fallback
+    raise ImportError("No HTML parser installed; install selectolax or beautifulsoup4")
+
+
+BACKEND = _resolve_backend(HTML_PARSER)
+
+
+def parse_html(html: Union[bytes, str], backend: Optional[str] = None) -> Document:
+    """
+    Parse a page with the configured backend.
+
+    Args:
+        html: Raw page body; bytes are decoded as UTF-8 like the scraped sites serve
+        backend: Override the configured backend ("selectolax" or "bs4")
+
+    Returns:
+        Parsed document
+    """
+    if isinstance(html, bytes):
+        html = html.decode("utf-8", errors="replace")
+
+    backend = _resolve_backend(backend) if backend else BACKEND
+    if backend == "selectolax":
+        tree = LexborHTMLParser(html)
+        return Document(LexborNode(tree), LexborNode(tree.body) if tree.body is not None else None)
+
+    soup = BeautifulSoup(html, "html.parser")
+    return Document(SoupNode(soup), SoupNode(soup.body) if soup.body is not None else None)
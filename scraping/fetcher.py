@@ -0,0 +1,170 @@
+"""
+Shared, connection-pooled HTTP client used by all scrapers.
+
+The client is opened on application startup and closed on shutdown so that
+TCP/TLS connections to the upstream hosts are reused across scrapes. Failed
+requests are retried with jittered exponential backoff within a time budget,
+and a circuit breaker per host fails requests fast while the host is down.
+"""
+import asyncio
+import logging
+import random
+import time
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+from config import (
+    HTTP_TIMEOUT_SECONDS, HTTP_MAX_CONNECTIONS, HTTP_MAX_KEEPALIVE_CONNECTIONS,
+    HTTP_KEEPALIVE_EXPIRY_SECONDS, HTTP_PER_HOST_CONCURRENCY, HTTP_RETRIES,
+    HTTP_RETRY_BACKOFF_SECONDS, HTTP_RETRY_MAX_BACKOFF_SECONDS, HTTP_RETRY_BUDGET_SECONDS
+)
+from .breaker import CircuitBreaker, CircuitOpenError
+
+logger = logging.getLogger(__name__)
+
+# HTTP/2 needs the optional `h2` package (installed with httpx[http2])
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# Headers sent with every request to mimic a regular browser
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.5",
+    "Upgrade-Insecure-Requests": "1",
+}
+
+
+# Response statuses worth retrying and counted as host failures
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class Fetcher:
+    """Pooled HTTP client with keep-alive, per-host concurrency limits, retries
+    and per-host circuit breakers."""
+
+    def __init__(
+        self,
+        per_host_limit: int = HTTP_PER_HOST_CONCURRENCY,
+        retries: int = HTTP_RETRIES,
+        retry_budget: float = HTTP_RETRY_BUDGET_SECONDS
+    ):
+        self.per_host_limit = per_host_limit
+        self.retries = max(0, retries)
+        self.retry_budget = retry_budget
+        self._client: Optional[httpx.AsyncClient] = None
+        self._host_semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+    def _create_client(self) -> httpx.AsyncClient:
+        limits = httpx.Limits(
+            max_connections=HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=HTTP_KEEPALIVE_EXPIRY_SECONDS,
+        )
+        return httpx.AsyncClient(
+            headers=DEFAULT_HEADERS,
+            timeout=HTTP_TIMEOUT_SECONDS,
+            limits=limits,
+            http2=HTTP2_AVAILABLE,
+            follow_redirects=True,
+        )
+
+    async def start(self) -> None:
+        """Open the shared client (called on application startup)."""
+        if self._client is None:
+            self._client = self._create_client()
+            logger.info(f"HTTP fetcher started (http2={'on' if HTTP2_AVAILABLE else 'off'})")
+
+    async def close(self) -> None:
+        """Close the shared client and its pooled connections."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            logger.info("HTTP fetcher closed")
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """The shared client, created lazily when used outside the app lifespan."""
+        if self._client is None:
+            self._client = self._create_client()
+        return self._client
+
+    def _semaphore_for(self, url: str) -> asyncio.Semaphore:
+        host = urlsplit(url).netloc
+        if host not in self._host_semaphores:
+            self._host_semaphores[host] = asyncio.Semaphore(self.per_host_limit)
+        return self._host_semaphores[host]
+
+    def _breaker_for(self, host: str) -> CircuitBreaker:
+        if host not in self._breakers:
+            self._breakers[host] = CircuitBreaker(host)
+        return self._breakers[host]
+
+    def circuit_states(self) -> Dict[str, Dict[str, Any]]:
+        """Get the circuit breaker state of every host contacted so far."""
+        return {host: breaker.describe() for host, breaker in self._breakers.items()}
+
+    @staticmethod
+    def _backoff(attempt: int) -> float:
+        # Full jitter: anywhere between zero and the exponential delay
+        return random.uniform(0, min(HTTP_RETRY_MAX_BACKOFF_SECONDS, HTTP_RETRY_BACKOFF_SECONDS * 2 ** attempt))
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        """
+        Send a GET request through the shared client.
+
+        Connection errors, timeouts and retryable statuses are retried up to
+        `retries` times while the retry budget lasts; the last response (even
+        an error status) is returned, or the last error raised.
+
+        Raises:
+            CircuitOpenError: The host's circuit is open
+            httpx.TransportError: The last attempt failed to get a response
+        """
+        host = urlsplit(url).netloc
+        breaker = self._breaker_for(host)
+        deadline = time.monotonic() + self.retry_budget
+        timeout = kwargs.pop("timeout", HTTP_TIMEOUT_SECONDS)
+
+        attempt = 0
+        while True:
+            if not breaker.allow():
+                raise CircuitOpenError(f"Circuit for {host} is open, next attempt in {breaker.retry_in:.0f} seconds")
+
+            response, error = None, None
+            try:
+                async with self._semaphore_for(url):
+                    remaining = max(1.0, deadline - time.monotonic())
+                    response = await self.client.get(url, timeout=min(timeout, remaining), **kwargs)
+            except httpx.TransportError as e:
+                error = e
+            except BaseException:
+                breaker.release()
+                raise
+
+            if response is not None and response.status_code not in RETRY_STATUSES:
+                breaker.record_success()
+                return response
+            breaker.record_failure()
+
+            delay = self._backoff(attempt)
+            attempt += 1
+            # No retry once the failure opened the circuit
+            if attempt > self.retries or breaker.state == "open" or time.monotonic() + delay >= deadline:
+                if response is not None:
+                    return response
+                raise error
+
+            reason = f"status {response.status_code}" if response is not None else type(error).__name__
+            logger.warning(f"GET {url} failed ({reason}), retry {attempt}/{self.retries} in {delay:.1f}s")
+            await asyncio.sleep(delay)
+
+
+# Singleton instance
+fetcher = Fetcher()
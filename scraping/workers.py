@@ -0,0 +1,56 @@
+"""
+Worker pool for CPU-bound HTML parsing.
+
+Parsing a page takes tens to hundreds of milliseconds of pure CPU work, so the
+parse step of every scraper runs here instead of on the event loop. A process
+pool is used by default so parses don't hold the GIL of the API process; set
+PARSE_POOL=thread to use threads instead.
+"""
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Optional, TypeVar
+
+from config import PARSE_POOL, PARSE_WORKERS
+
+logger = logging.getLogger(__name__)
+
+R = TypeVar("R")
+
+_parse_executor: Optional[Executor] = None
+
+
+def get_parse_executor() -> Executor:
+    """Get the shared parse pool, creating it on first use."""
+    global _parse_executor
+    if _parse_executor is None:
+        workers = max(1, PARSE_WORKERS)
+        if PARSE_POOL == "process":
+            try:
+                # spawn avoids forking the API process with its threads and open connections
+                _parse_executor = ProcessPoolExecutor(
+                    max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+                )
+            except (OSError, NotImplementedError) as e:
+                logger.warning(f"Process pool unavailable ({e}), parsing in threads instead")
+        if _parse_executor is None:
+            _parse_executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="parse")
+    return _parse_executor
+
+
+async def run_parser(func: Callable[..., R], *args: Any) -> R:
+    """Run a pure parse function in the parse pool.
+
+    `func` must be a module-level function so it can be sent to a worker process.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_parse_executor(), func, *args)
+
+
+def shutdown_parse_executor() -> None:
+    """Shut the parse pool down (called on application shutdown)."""
+    global _parse_executor
+    if _parse_executor is not None:
+        _parse_executor.shutdown(wait=False, cancel_futures=True)
+        _parse_executor = None
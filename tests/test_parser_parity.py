@@ -0,0 +1,94 @@
+"""
+Parity of the HTML parser backends.
+
+Every parse function is run with both selectolax and BeautifulSoup behind
+`scraping.dom.parse_html` and must produce identical rows.
+
+Except for `rashifal_not_found.html`, which is a real page served by
+hamropatro in place of the rashifal, the pages in `fixtures/` are hand-written.
+They reproduce the selectors, Devanagari digits and inline styles the parsers
+rely on, plus markup quirks both backends handle alike (comments, entities,
+<br>, unquoted and upper-case attributes, markup inside <script>). They don't
+show how the backends compare on the full live pages. The backends do differ
+on implied end tags, see `test_unclosed_tags_differ`.
+"""
+from pathlib import Path
+
+import pytest
+
+from scraping import dom
+from scraping.calendar import parse_calendar, parse_panchang
+from scraping.events import parse_events
+from scraping.forex import parse_forex
+from scraping.metals import parse_metals
+from scraping.rashifal import parse_rashifal
+from scraping.vegetables import parse_vegetables
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+TODAY = "2025-05-24"
+
+# Fixture page -> (parse function, arguments after the page body)
+PARSERS = {
+    "calendar": (parse_calendar, (2082, 2)),
+    "panchang": (parse_panchang, ()),
+    "events": (parse_events, ()),
+    "forex": (parse_forex, (TODAY,)),
+    "metals": (parse_metals, (TODAY,)),
+    "rashifal": (parse_rashifal, (TODAY,)),
+    "vegetables": (parse_vegetables, (TODAY,)),
+}
+
+pytestmark = pytest.mark.skipif(
+    dom.LexborHTMLParser is None or dom.BeautifulSoup is None,
+    reason="needs both selectolax and beautifulsoup4"
+)
+
+
+def parse_with(backend: str, monkeypatch, page: str):
+    """Parse a fixture page with the parse function of its source on `backend`."""
+    parse, args = PARSERS[page]
+    monkeypatch.setattr(dom, "BACKEND", backend)
+    return parse((FIXTURES / f"{page}.html").read_bytes(), *args)
+
+
+@pytest.mark.parametrize("page", sorted(PARSERS))
+def test_backends_parse_identically(page, monkeypatch):
+    selectolax = parse_with("selectolax", monkeypatch, page)
+    bs4 = parse_with("bs4", monkeypatch, page)
+
+    assert selectolax, f"{page} fixture parsed to nothing"
+    assert selectolax == bs4
+
+
+@pytest.mark.parametrize("backend", ["selectolax", "bs4"])
+def test_parse_html_uses_requested_backend(backend):
+    document = dom.parse_html(b"<html><body><p class='a b'>x</p></body></html>", backend=backend)
+    expected = dom.LexborNode if backend == "selectolax" else dom.SoupNode
+
+    node = document.select_one("p")
+    assert isinstance(node, expected)
+    assert node.text == "x"
+    assert node.classes == ["a", "b"]
+    assert document.body.tag == "body"
+
+
+@pytest.mark.parametrize("backend", ["selectolax", "bs4"])
+def test_error_page_parses_to_nothing(backend, monkeypatch):
+    monkeypatch.setattr(dom, "BACKEND", backend)
+    page = (FIXTURES / "rashifal_not_found.html").read_bytes()
+
+    assert parse_rashifal(page, TODAY) == []
+
+
+def test_unclosed_tags_differ():
+    """lexbor closes unclosed <td> and <p> like browsers do; html.parser nests them."""
+    html = b"<table><tr><td>USD<td>1<td>136.50</table><div><p>one<p>two</div>"
+    lexbor = dom.parse_html(html, backend="selectolax")
+    soup = dom.parse_html(html, backend="bs4")
+
+    assert [cell.text for cell in lexbor.select("td")] == ["USD", "1", "136.50"]
+    assert [cell.text for cell in soup.select("td")] == ["USD1136.50", "1136.50", "136.50"]
+    assert lexbor.select_one("p").text == "one"
+    assert soup.select_one("p").text == "onetwo"
+